@@ -0,0 +1,88 @@
+"""
+Translation chunking: token-budget chunker vs. the old 2,000-character paragraph splitter.
+
+For each sample text, reports how many Groq calls each approach needs, the largest chunk
+in estimated tokens, and chunks over budget. A randomized pass checks the token chunker
+is lossless ("".join(chunks) == text) and respects the budget on awkward inputs.
+
+Usage (from backend/):
+    python benchmarks/chunking.py
+    python benchmarks/chunking.py --budget 800 --fuzz 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_logic import split_text_into_chunks  # noqa: E402
+from services.chunker import estimate_tokens, split_by_tokens  # noqa: E402
+
+SENTENCE = "Chlorophyll absorbs red and blue light, reflecting green; this is why leaves look green to us. "
+URDU_SENTENCE = "پودے سورج کی روشنی سے اپنی خوراک بناتے ہیں، اور آکسیجن خارج کرتے ہیں۔ "
+
+
+def samples():
+    rng = random.Random(0)
+    paragraphs = [SENTENCE * rng.randint(2, 8) for _ in range(60)]
+    return {
+        "short_script": SENTENCE * 10,
+        "paragraphs_60": "\n\n".join(paragraphs),
+        "one_long_paragraph": SENTENCE * 400,
+        "lists_and_breaks": "\n".join(f"{i}. {SENTENCE}" for i in range(300)),
+        "urdu_paragraphs": "\n\n".join(URDU_SENTENCE * rng.randint(2, 8) for _ in range(40)),
+    }
+
+
+def describe(chunks, budget):
+    tokens = [estimate_tokens(chunk) for chunk in chunks]
+    return {
+        "calls": len(chunks),
+        "max_chunk_tokens": max(tokens, default=0),
+        "chunks_over_budget": sum(1 for count in tokens if count > budget)
+    }
+
+
+def fuzz(rounds, seed=1):
+    rng = random.Random(seed)
+    pieces = [
+        "word ", "Sentence ends. ", "Question? ", "clause, ", "semi; ", "\n", "\n\n", "  \n \n",
+        "۔ ", "。", "中文", "x" * 80, "12345", "\t", "naïve ", "_"
+    ]
+    lossy = 0
+    over_budget = 0
+    for _ in range(rounds):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 300)))
+        budget = rng.choice([1, 3, 10, 50, 400])
+        chunks = split_by_tokens(text, budget)
+        if "".join(chunks) != text:
+            lossy += 1
+        if any(estimate_tokens(chunk) > budget for chunk in chunks):
+            over_budget += 1
+    return {"rounds": rounds, "lossy": lossy, "over_budget": over_budget}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=1500, help="token budget per chunk")
+    parser.add_argument("--fuzz", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {}
+    for name, text in samples().items():
+        results[name] = {
+            "estimated_tokens": estimate_tokens(text),
+            "characters_2000": describe(split_text_into_chunks(text, max_length=2000), args.budget),
+            "tokens": describe(split_by_tokens(text, args.budget), args.budget),
+        }
+
+    report = {"budget": args.budget, "samples": results, "fuzz": fuzz(args.fuzz)}
+    print(json.dumps(report, indent=2))
+    if report["fuzz"]["lossy"] or report["fuzz"]["over_budget"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
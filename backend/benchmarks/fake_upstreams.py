@@ -0,0 +1,210 @@
+"""
+Local stand-ins for the services the backend calls, with configurable latency:
+
+    POST /openai/v1/chat/completions               Groq (OpenAI-compatible, streaming supported)
+    GET  /w/api.php                                Wikipedia (MediaWiki query API, extracts)
+    POST /_/TranslateWebserverUi/data/batchexecute gTTS (Google Translate batchexecute)
+
+Run standalone to poke at it, or import FakeUpstreams (load_test.py does).
+    python benchmarks/fake_upstreams.py --port 9100 --groq-latency 0.5
+"""
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPT_TEXT = (
+    "Photosynthesis is the process plants use to turn light into chemical energy. "
+    "Inside the chloroplasts, chlorophyll absorbs sunlight and drives the splitting of water. "
+    "The oxygen we breathe is released as a by-product, while carbon dioxide is fixed into sugars. "
+    "These sugars fuel growth and, through food chains, almost every living thing on Earth. "
+)
+
+# MP3 frame header followed by padding; real players would choke but the backend only stores bytes
+FAKE_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse behaves like the real services
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _maybe_fail(self):
+        if self.server.failure_rate and self.server.random.random() < self.server.failure_rate:
+            self._send(503, b'{"error": {"message": "injected failure"}}')
+            return True
+        return False
+
+    def do_GET(self):
+        parsed = urllib.parse.urlparse(self.path)
+        if parsed.path.endswith("/w/api.php"):
+            self.server.count("wikipedia")
+            time.sleep(self.server.wiki_latency)
+            if self._maybe_fail():
+                return
+            params = urllib.parse.parse_qs(parsed.query)
+            title = (params.get("titles") or params.get("gsrsearch") or ["Topic"])[0]
+            page = {"pageid": zlib.crc32(title.encode("utf-8")), "title": title, "index": 1, "extract": SCRIPT_TEXT}
+            self._send(200, json.dumps({"query": {"pages": [page]}}).encode("utf-8"))
+        else:
+            self._send(404, b"{}")
+
+    def do_POST(self):
+        path = urllib.parse.urlparse(self.path).path
+        body = self._read_body()
+        if path.endswith("/chat/completions"):
+            self.server.count("groq")
+            self._chat_completion(json.loads(body or b"{}"))
+        elif path.endswith("/batchexecute"):
+            self.server.count("tts")
+            time.sleep(self.server.tts_latency)
+            if self._maybe_fail():
+                return
+            self._tts(body)
+        else:
+            self._send(404, b"{}")
+
+    def _completion_text(self, request):
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        if "Text to translate:" in prompt:
+            # Translation: hand back the chunk so output size tracks input size
+            return "[translated] " + prompt.split("Text to translate:", 1)[1].strip()
+        words = re.search(r"approximately (\d+) words", prompt)
+        target = int(words.group(1)) if words else 120
+        base = SCRIPT_TEXT.split()
+        return " ".join(base[i % len(base)] for i in range(min(target, self.server.max_completion_words)))
+
+    def _chat_completion(self, request):
+        time.sleep(self.server.groq_latency)
+        if self._maybe_fail():
+            return
+        text = self._completion_text(request)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = request.get("model", "fake")
+
+        if not request.get("stream"):
+            response = {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": len(text.split()), "total_tokens": 100 + len(text.split())}
+            }
+            self._send(200, json.dumps(response).encode("utf-8"))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write_event(payload):
+            data = f"data: {payload}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        for word in text.split(" "):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]
+            }
+            write_event(json.dumps(chunk))
+            time.sleep(self.server.token_interval)
+        write_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _tts(self, body):
+        # f.req carries [[["jQ1olc", "[text, lang, speed, null]", null, "generic"]]]
+        try:
+            rpc = json.loads(urllib.parse.parse_qs(body.decode("utf-8"))["f.req"][0])
+            text = json.loads(rpc[0][0][1])[0]
+        except (KeyError, IndexError, ValueError):
+            self._send(400, b"{}")
+            return
+        frames = max(1, len(text) // 20)
+        audio = base64.b64encode(FAKE_MP3_FRAME * frames).decode("ascii")
+        line = f'[["wrb.fr","jQ1olc","[\\"{audio}\\"]",null,null,null,"generic"]]'
+        self._send(200, f")]}}'\n\n{len(line)}\n{line}\n".encode("utf-8"), "application/json; charset=utf-8")
+
+
+class FakeUpstreams(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, groq_latency=0.5, token_interval=0.01, wiki_latency=0.1, tts_latency=0.2,
+                 failure_rate=0.0, max_completion_words=400, seed=0):
+        super().__init__(("127.0.0.1", port), FakeUpstreamHandler)
+        self.groq_latency = groq_latency
+        self.token_interval = token_interval
+        self.wiki_latency = wiki_latency
+        self.tts_latency = tts_latency
+        self.failure_rate = failure_rate
+        self.max_completion_words = max_completion_words
+        self.random = random.Random(seed)
+        self.calls = {"groq": 0, "wikipedia": 0, "tts": 0}
+        self._calls_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, service):
+        with self._calls_lock:
+            self.calls[service] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--groq-latency", type=float, default=0.5, help="seconds before the first token")
+    parser.add_argument("--token-interval", type=float, default=0.01, help="seconds between streamed tokens")
+    parser.add_argument("--wiki-latency", type=float, default=0.1)
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="seconds per gTTS request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of calls answered with 503")
+    args = parser.parse_args()
+
+    upstreams = FakeUpstreams(
+        args.port, args.groq_latency, args.token_interval, args.wiki_latency, args.tts_latency, args.failure_rate
+    )
+    print(f"Fake upstreams listening on {upstreams.url}")
+    try:
+        upstreams.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
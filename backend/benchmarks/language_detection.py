@@ -0,0 +1,124 @@
+"""
+Language detection: langdetect.detect on the full text (the old per-request call) vs. the
+sampled, seeded, memoized LanguageDetector.
+
+For each document size, reports the time per call for
+    full_text       langdetect.detect(text), unseeded, as the endpoints used to call it
+    sampled_cold    LanguageDetector on a memo miss (sampling + one detection on the sample)
+    sampled_warm    LanguageDetector.detect on a text seen before (hash lookup only)
+plus whether both agree on the language, and how many distinct answers repeated unseeded
+full-text calls give (the seeded detector always gives one). A final case times detect_batch
+on a mix of documents with repeats against one full-text call per document.
+
+Usage (from backend/):
+    python benchmarks/language_detection.py
+    python benchmarks/language_detection.py --sizes 1000,10000,50000 --repeat 3
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.language_detector import LanguageDetector  # noqa: E402
+
+VOCABULARIES = {
+    "en": "the plant uses light energy from the sun to turn water and carbon dioxide into sugar and oxygen".split(),
+    "es": "la planta usa la energía de la luz del sol para convertir agua y dióxido de carbono en azúcar".split(),
+    "fr": "la plante utilise l'énergie de la lumière du soleil pour transformer l'eau et le gaz en sucre".split(),
+    "ur": "پودے سورج کی روشنی سے اپنی خوراک بناتے ہیں اور آکسیجن خارج کرتے ہیں یہ عمل ضیائی تالیف کہلاتا ہے".split(),
+}
+
+
+def make_document(language, words, seed=0):
+    rng = random.Random(f"{language}:{words}:{seed}")
+    vocabulary = VOCABULARIES[language]
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        size = min(remaining, rng.randint(8, 20))
+        sentences.append(" ".join(rng.choice(vocabulary) for _ in range(size)) + ".")
+        remaining -= size
+    return " ".join(sentences)
+
+
+def per_call(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="document sizes in words")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stability-runs", type=int, default=5, help="unseeded full-text calls per document")
+    parser.add_argument("--sample-chars", type=int, default=2000)
+    parser.add_argument("--windows", type=int, default=4)
+    args = parser.parse_args()
+
+    from langdetect import detect
+
+    warm = LanguageDetector(args.sample_chars, args.windows)
+    warm.detect("warm up the profiles")
+    results = []
+    mismatches = 0
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        for language in VOCABULARIES:
+            text = make_document(language, size)
+            full_seconds, full_answer = per_call(lambda: detect(text), args.repeat)
+            # Memo miss: sample, hash, detect (profiles already loaded, as in a long-running worker)
+            cold_seconds, sampled_answer = per_call(lambda: warm._detect_sample(warm.sample(text)), args.repeat)
+            warm.detect(text)
+            warm_seconds, _ = per_call(lambda: warm.detect(text), args.repeat)
+            distinct = {detect(text) for _ in range(args.stability_runs)}
+            if sampled_answer != full_answer:
+                mismatches += 1
+            results.append({
+                "words": size,
+                "language": language,
+                "full_text_ms": round(full_seconds * 1000, 2),
+                "sampled_cold_ms": round(cold_seconds * 1000, 2),
+                "sampled_warm_us": round(warm_seconds * 1e6, 1),
+                "speedup_cold": round(full_seconds / cold_seconds, 1),
+                "full_text_answer": full_answer,
+                "sampled_answer": sampled_answer,
+                "full_text_distinct_answers": len(distinct)
+            })
+
+    # A batch with repeats, like one document's chunks or several uploads of the same file
+    documents = [make_document(language, 10000, seed) for language in VOCABULARIES for seed in range(3)]
+    batch = documents * 3
+    full_seconds, _ = per_call(lambda: [detect(text) for text in batch], 1)
+    fresh = LanguageDetector(args.sample_chars, args.windows)
+    fresh._factory = warm._get_factory()  # empty memo, loaded profiles
+    batch_seconds, _ = per_call(lambda: fresh.detect_batch(batch), 1)
+
+    report = {
+        "sample_chars": args.sample_chars,
+        "windows": args.windows,
+        "results": results,
+        "batch": {
+            "texts": len(batch),
+            "distinct_texts": len(documents),
+            "full_text_s": round(full_seconds, 3),
+            "detect_batch_s": round(batch_seconds, 3),
+            "speedup": round(full_seconds / batch_seconds, 1)
+        },
+        "language_mismatches": mismatches
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Load test: runs the app against local fake Groq/Wikipedia/gTTS servers and drives each endpoint
+at a fixed concurrency. Reports throughput and p50/p95/p99 latency per endpoint as JSON.
+
+Streamed endpoints (SSE and audio) also report time to the first byte. Job scenarios submit to
+/jobs/* and poll the result URL until the job finishes; their latency runs from submit to result,
+and accepted_ms is the time to the 202.
+
+While each endpoint is under load, a separate connection polls /health. A slow /health means
+something is blocking the event loop.
+
+Usage (from backend/):
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --endpoints generate-script,text-to-speech --requests 100 --concurrency 16
+    python benchmarks/load_test.py --groq-latency 1.5 --tts-latency 0.4 --output results.json
+    python benchmarks/load_test.py --llm-backend local --token-interval 0
+
+--llm-backend http (default) sends LLM calls to the fake Groq server, exercising the HTTP client pool;
+local switches the app to its in-process stand-in (LLM_BACKEND=local) with the same latency settings.
+
+Payloads differ per request so caches and request coalescing don't hide the work; pass --repeat-payloads
+to measure them.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from fake_upstreams import SCRIPT_TEXT, FakeUpstreams
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LESSON_TEXT = SCRIPT_TEXT * 3
+
+
+def _document(i):
+    return {"file": (f"notes_{i}.txt", (f"Lesson {i}. " + LESSON_TEXT * 20).encode("utf-8"), "text/plain")}
+
+
+def _batch_speech_items(i):
+    # A repeated item (synthesized once) and one with its language given
+    return [
+        {"text": f"Lesson {i}. " + SCRIPT_TEXT},
+        {"text": f"Summary {i}. " + SCRIPT_TEXT, "language": "english"},
+        {"text": f"Lesson {i}. " + SCRIPT_TEXT}
+    ]
+
+
+# name -> (method, path, request kwargs for payload number i, mode); mode is one of
+#   "request"  plain request/response
+#   "stream"   streamed response (SSE, audio), timed to the first byte and to the end
+#   "job"      202 from /jobs/*, then GET {status_url}/result until it stops answering 202
+SCENARIOS = {
+    "generate-script": ("POST", "/generate-script", lambda i: {"json": {"topic": f"Photosynthesis {i}", "duration": 1}}, "request"),
+    "generate-video-script": ("POST", "/generate-video-script", lambda i: {"json": {"topic": f"Volcanoes {i}", "duration": 1}}, "request"),
+    "generate-script-stream": ("POST", "/generate-script/stream", lambda i: {"json": {"topic": f"Gravity {i}", "duration": 1}}, "stream"),
+    "generate-video-script-stream": ("POST", "/generate-video-script/stream", lambda i: {"json": {"topic": f"Magnetism {i}", "duration": 1}}, "stream"),
+    "translate-script": ("POST", "/translate-script", lambda i: {"json": {"text": f"Lesson {i}. " + LESSON_TEXT, "target_language": "spanish"}}, "request"),
+    "translate-script-batch": ("POST", "/translate-script/batch", lambda i: {"json": {
+        "text": f"Lesson {i}. " + LESSON_TEXT, "target_languages": ["spanish", "french", "german"]
+    }}, "stream"),
+    "text-to-speech": ("POST", "/text-to-speech", lambda i: {"json": {"text": f"Lesson {i}. " + LESSON_TEXT}}, "request"),
+    "text-to-speech-stream": ("POST", "/text-to-speech/stream", lambda i: {"json": {"text": f"Lesson {i}. " + LESSON_TEXT}}, "stream"),
+    "text-to-speech-batch": ("POST", "/text-to-speech/batch", lambda i: {"json": {"items": _batch_speech_items(i)}}, "request"),
+    "upload-document": ("POST", "/upload-document", lambda i: {"files": _document(i)}, "request"),
+    "pipeline": ("POST", "/pipeline", lambda i: {"json": {
+        "topic": f"Ecosystems {i}", "duration": 1, "target_languages": ["spanish", "french"]
+    }}, "request"),
+    "jobs-generate-script": ("POST", "/jobs/generate-script", lambda i: {"json": {"topic": f"Erosion {i}", "duration": 1}}, "job"),
+    "jobs-translate-script": ("POST", "/jobs/translate-script", lambda i: {"json": {
+        "text": f"Lesson {i}. " + LESSON_TEXT, "target_language": "french"
+    }}, "job"),
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = min(max(1, math.ceil(fraction * len(sorted_values))), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(latencies):
+    values = sorted(latencies)
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "mean": None}
+    return {
+        "p50": round(percentile(values, 0.50) * 1000, 1),
+        "p95": round(percentile(values, 0.95) * 1000, 1),
+        "p99": round(percentile(values, 0.99) * 1000, 1),
+        "max": round(values[-1] * 1000, 1),
+        "mean": round(sum(values) / len(values) * 1000, 1)
+    }
+
+
+async def send(client, scenario, i, poll_interval=0.1):
+    """Returns (latency, time to first byte or to the job's 202, status code or error string)"""
+    method, path, payload, mode = scenario
+    started = time.perf_counter()
+    try:
+        if mode == "stream":
+            first_byte = None
+            async with client.stream(method, path, **payload(i)) as response:
+                async for _ in response.aiter_raw():
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - started
+            return time.perf_counter() - started, first_byte, response.status_code
+        response = await client.request(method, path, **payload(i))
+        if mode == "job":
+            accepted = time.perf_counter() - started
+            if response.status_code != 202:
+                return accepted, accepted, response.status_code
+            result_url = response.json()["status_url"] + "/result"
+            while True:
+                await asyncio.sleep(poll_interval)
+                response = await client.get(result_url)
+                if response.status_code != 202:
+                    return time.perf_counter() - started, accepted, response.status_code
+        elapsed = time.perf_counter() - started
+        return elapsed, elapsed, response.status_code
+    except httpx.HTTPError as e:
+        return time.perf_counter() - started, None, type(e).__name__
+
+
+async def probe_health(base_url, stop, interval):
+    latencies = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                await client.get("/health")
+                latencies.append(time.perf_counter() - started)
+            except httpx.HTTPError:
+                pass
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+    return latencies
+
+
+async def run_scenario(base_url, name, requests, concurrency, warmup, repeat_payloads, probe_interval, offset,
+                       poll_interval):
+    scenario = SCENARIOS[name]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        for i in range(warmup):
+            await send(client, scenario, -1 - i, poll_interval)
+
+        next_index = iter(range(requests))
+        results = []
+
+        async def worker():
+            for i in next_index:
+                results.append(await send(client, scenario, 0 if repeat_payloads else offset + i, poll_interval))
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_health(base_url, stop, probe_interval))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+        stop.set()
+        probe_latencies = await probe
+
+    statuses = {}
+    for _, _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    ok = [result for result in results if isinstance(result[2], int) and result[2] < 400]
+    report = {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "status_counts": statuses,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(ok) / wall, 2) if wall else None,
+        "latency_ms": latency_summary([latency for latency, _, _ in ok]),
+        "health_probe_ms": latency_summary(probe_latencies)
+    }
+    if scenario[3] in ("stream", "job"):
+        key = "first_byte_ms" if scenario[3] == "stream" else "accepted_ms"
+        report[key] = latency_summary([first for _, first, _ in ok if first is not None])
+    return report
+
+
+def stage_means(metrics_text):
+    """Mean duration per internal stage from the app's /metrics"""
+    sums = dict(re.findall(r'eduai_stage_duration_seconds_sum\{stage="([^"]+)"\} (\S+)', metrics_text))
+    counts = dict(re.findall(r'eduai_stage_duration_seconds_count\{stage="([^"]+)"\} (\S+)', metrics_text))
+    return {
+        stage: {"count": int(float(counts[stage])), "mean_ms": round(float(total) / float(counts[stage]) * 1000, 1)}
+        for stage, total in sums.items()
+        if float(counts.get(stage, 0))
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(port, upstream_url, workdir, llm_env):
+    env = {
+        **os.environ,
+        **llm_env,
+        "Groq_API_Key": "benchmark",
+        "GROQ_BASE_URL": upstream_url,
+        "WIKIPEDIA_API_URL": f"{upstream_url}/w/api.php",
+        "CACHE_DIR": os.path.join(workdir, "cache"),
+        "JOB_DB_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "PYTHONUNBUFFERED": "1"
+    }
+    log = open(os.path.join(workdir, "server.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARKS_DIR, "serve_app.py"), "--port", str(port), "--gtts-url", upstream_url],
+        cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    return process, log
+
+
+def wait_until_healthy(base_url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("App did not become healthy in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", default=",".join(SCENARIOS), help=f"comma-separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=40, help="measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured requests per endpoint")
+    parser.add_argument("--repeat-payloads", action="store_true", help="send the same payload every time (warm caches, coalescing)")
+    parser.add_argument("--llm-backend", choices=("http", "local"), default="http",
+                        help="fake Groq over HTTP, or the app's in-process local backend")
+    parser.add_argument("--groq-latency", type=float, default=0.5, help="fake Groq seconds before the first token")
+    parser.add_argument("--token-interval", type=float, default=0.005, help="fake Groq seconds between streamed tokens")
+    parser.add_argument("--wiki-latency", type=float, default=0.1)
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="fake gTTS seconds per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of upstream calls answered with 503")
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="seconds between /health probes")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="seconds between job result polls")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--keep-workdir", action="store_true", help="keep the temp dir with server.log and caches")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    upstreams = FakeUpstreams(
+        groq_latency=args.groq_latency, token_interval=args.token_interval, wiki_latency=args.wiki_latency,
+        tts_latency=args.tts_latency, failure_rate=args.failure_rate
+    ).start()
+    workdir = tempfile.mkdtemp(prefix="eduai-bench-")
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    llm_env = {"LLM_BACKEND": "groq"}
+    if args.llm_backend == "local":
+        llm_env = {
+            "LLM_BACKEND": "local",
+            "LOCAL_LLM_LATENCY": str(args.groq_latency),
+            "LOCAL_LLM_TOKENS_PER_SECOND": str(1 / args.token_interval if args.token_interval else 0),
+            "LOCAL_LLM_FAILURE_RATE": str(args.failure_rate)
+        }
+    process, log = start_app(port, upstreams.url, workdir, llm_env)
+
+    try:
+        wait_until_healthy(base_url, process)
+        endpoints = {}
+        for offset, name in enumerate(names):
+            endpoints[name] = asyncio.run(run_scenario(
+                base_url, name, args.requests, args.concurrency, args.warmup,
+                args.repeat_payloads, args.probe_interval, offset * 1_000_000, args.poll_interval
+            ))
+        metrics_text = httpx.get(f"{base_url}/metrics", timeout=10).text
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        log.close()
+        upstreams.stop()
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "llm_backend": args.llm_backend,
+            "repeat_payloads": args.repeat_payloads,
+            "groq_latency": args.groq_latency,
+            "token_interval": args.token_interval,
+            "wiki_latency": args.wiki_latency,
+            "tts_latency": args.tts_latency,
+            "failure_rate": args.failure_rate,
+            "poll_interval": args.poll_interval
+        },
+        "endpoints": endpoints,
+        "stages": stage_means(metrics_text),
+        "upstream_calls": upstreams.calls
+    }
+    if args.keep_workdir:
+        report["workdir"] = workdir
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Run the backend for benchmarking with gTTS pointed at a local stand-in.
+
+Groq and Wikipedia are redirected through configuration alone (GROQ_BASE_URL, WIKIPEDIA_API_URL);
+gTTS hard-codes the Google Translate host, so its URL builder is replaced here before the app loads.
+
+    python benchmarks/serve_app.py --port 8100 --gtts-url http://127.0.0.1:9100
+"""
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--gtts-url", required=True, help="base URL of the fake gTTS endpoint")
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    gtts_url = args.gtts_url.rstrip("/")
+
+    import gtts.tts
+    gtts.tts._translate_url = lambda tld="com", path="": f"{gtts_url}/{path}"
+
+    # Single process: the redirect above would not carry over to uvicorn workers
+    import uvicorn
+    uvicorn.run("main:app", host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
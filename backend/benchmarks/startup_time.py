@@ -0,0 +1,83 @@
+"""
+Startup benchmark: how long a fresh interpreter takes to import the app, and which modules dominate.
+
+Usage (from backend/):
+    python benchmarks/startup_time.py --runs 5
+    python benchmarks/startup_time.py --module core_logic --top 15
+
+Prints a JSON report. Compare against a checkout before lazy loading to see the difference.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = (
+    "import time; started = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def time_import(module, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(module=module)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def slowest_imports(module, top):
+    """Parse `python -X importtime` output; returns the modules with the largest cumulative time"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # header line
+        rows.append((int(fields[1]), fields[2].rstrip()))
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return [
+        {
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "cumulative_ms": round(cumulative / 1000, 2)
+        }
+        for cumulative, name in rows[:top]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    timings = time_import(args.module, args.runs)
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "import_seconds": {
+            "min": round(min(timings), 4),
+            "median": round(statistics.median(timings), 4),
+            "max": round(max(timings), 4)
+        },
+        "slowest_imports": slowest_imports(args.module, args.top)
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Micro-benchmarks for the text hot paths in core_logic, old implementation vs. current:
+
+    split_text_into_chunks   string concatenation per paragraph  vs. offset tracking, one slice per chunk
+    clean_markdown           five chained str.replace passes      vs. one translate (ASCII) / two replaces
+    count_words              len(text.split())                    vs. windowed split
+
+Every case first checks that both implementations return identical output, and a randomized
+pass does the same on awkward inputs (empty paragraphs, oversized paragraphs, stray newlines).
+
+Usage (from backend/):
+    python benchmarks/text_hot_paths.py
+    python benchmarks/text_hot_paths.py --sizes 1000,100000 --repeat 7 --fuzz 2000
+
+Prints a JSON report with the best-of-repeat time per call, in microseconds, and the speedup.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_logic import clean_markdown, count_words, split_text_into_chunks  # noqa: E402
+
+WORDS = [
+    "photosynthesis", "light", "energy", "**chlorophyll**", "the", "plant", "cells", "absorb",
+    "## Scene", "[camera pans]", "*water*", "oxygen", "sugar", "### Summary", "carbon", "dioxide."
+]
+URDU_WORDS = ["ضیائی", "تالیف", "پودے", "**روشنی**", "## منظر", "توانائی", "پانی", "۔"]
+
+
+# Implementations as they were before the optimization, kept here as the reference
+def legacy_split_text_into_chunks(text, max_length=2000):
+    if len(text) <= max_length:
+        return [text]
+    chunks = []
+    paragraphs = text.split('\n\n')
+    current_chunk = ""
+    for paragraph in paragraphs:
+        if len(current_chunk + paragraph) <= max_length:
+            current_chunk += paragraph + "\n\n"
+        else:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = paragraph + "\n\n"
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def legacy_clean_markdown(text):
+    return text.replace("**", "").replace("*", "").replace("###", "").replace("##", "").replace("#", "")
+
+
+def legacy_count_words(text):
+    return len(text.split())
+
+
+def make_text(word_count, vocabulary, seed=0):
+    """Paragraphs of 40-120 words, like a generated script"""
+    rng = random.Random(seed)
+    paragraphs = []
+    remaining = word_count
+    while remaining > 0:
+        size = min(remaining, rng.randint(40, 120))
+        paragraphs.append(" ".join(rng.choice(vocabulary) for _ in range(size)))
+        remaining -= size
+    return "\n\n".join(paragraphs)
+
+
+def best_time(function, argument, repeat):
+    calls = max(1, int(20000 / max(1, len(argument) // 100)))  # keep each timing run short
+    timings = timeit.repeat(lambda: function(argument), number=calls, repeat=repeat)
+    return min(timings) / calls
+
+
+def peak_bytes(function, argument):
+    tracemalloc.start()
+    function(argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+CASES = {
+    "split_text_into_chunks": (legacy_split_text_into_chunks, split_text_into_chunks),
+    "clean_markdown": (legacy_clean_markdown, clean_markdown),
+    "count_words": (legacy_count_words, count_words),
+}
+
+
+def fuzz(rounds, seed=1):
+    """Random texts with the edge cases real input has; returns the number of mismatches per case"""
+    rng = random.Random(seed)
+    pieces = ["word", "**bold**", "#", "\n", "\n\n", "\n\n\n", " ", "\t", "x" * 50, "ü", "۔", " ", "\x1c"]
+    mismatches = {name: 0 for name in CASES}
+    for _ in range(rounds):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 400)))
+        max_length = rng.choice([1, 5, 20, 100, 2000])
+        if legacy_split_text_into_chunks(text, max_length) != split_text_into_chunks(text, max_length):
+            mismatches["split_text_into_chunks"] += 1
+        if legacy_clean_markdown(text) != clean_markdown(text):
+            mismatches["clean_markdown"] += 1
+        if legacy_count_words(text) != count_words(text, window=rng.choice([1, 3, 64, 16384])):
+            mismatches["count_words"] += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="input sizes in words")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fuzz", type=int, default=1000, help="randomized equivalence rounds")
+    args = parser.parse_args()
+
+    mismatches = fuzz(args.fuzz)
+    results = []
+    for size in (int(size) for size in args.sizes.split(",")):
+        for script, vocabulary in (("latin", WORDS), ("urdu", URDU_WORDS)):
+            text = make_text(size, vocabulary)
+            for name, (legacy, current) in CASES.items():
+                if legacy(text) != current(text):
+                    raise SystemExit(f"{name} output differs from the legacy implementation ({size} words, {script})")
+                legacy_seconds = best_time(legacy, text, args.repeat)
+                current_seconds = best_time(current, text, args.repeat)
+                results.append({
+                    "function": name,
+                    "words": size,
+                    "script": script,
+                    "legacy_us": round(legacy_seconds * 1e6, 1),
+                    "current_us": round(current_seconds * 1e6, 1),
+                    "speedup": round(legacy_seconds / current_seconds, 2),
+                    "legacy_peak_kib": peak_bytes(legacy, text) // 1024,
+                    "current_peak_kib": peak_bytes(current, text) // 1024
+                })
+
+    print(json.dumps({"fuzz_rounds": args.fuzz, "fuzz_mismatches": mismatches, "results": results}, indent=2))
+    if any(mismatches.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
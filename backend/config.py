@@ -20,7 +20,16 @@ class Settings:
     ]
     
     # File Upload Configuration
-    MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 256 * 1024  # uploads are hashed and copied in chunks of this size
+    UPLOAD_FORM_OVERHEAD: int = 64 * 1024  # multipart boundaries and part headers allowed on top of MAX_FILE_SIZE
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))  # smaller PDFs are parsed by one worker
+    PDF_PAGES_PER_RANGE: int = int(os.getenv("PDF_PAGES_PER_RANGE", "16"))
+    LANGDETECT_SAMPLE_CHARS: int = int(os.getenv("LANGDETECT_SAMPLE_CHARS", "10000"))  # leading text used for detection
+    LANGDETECT_MAX_CHARS: int = int(os.getenv("LANGDETECT_MAX_CHARS", "2000"))  # characters langdetect actually analyses
+    LANGDETECT_WINDOWS: int = int(os.getenv("LANGDETECT_WINDOWS", "4"))  # evenly spaced windows those characters come from
+    LANGDETECT_CACHE_SIZE: int = int(os.getenv("LANGDETECT_CACHE_SIZE", "4096"))
+    LANGDETECT_SEED: int = int(os.getenv("LANGDETECT_SEED", "0"))  # fixed seed: same text, same answer
     ALLOWED_FILE_TYPES: list = [
         "text/plain",
         "application/pdf", 
@@ -34,5 +43,83 @@ class Settings:
     # Audio Configuration
     AUDIO_OUTPUT_DIR: str = "audio_files"
     SUPPORTED_AUDIO_FORMATS: list = ["mp3", "wav", "ogg"]
+    AUDIO_STORE_MAX_BYTES: int = int(os.getenv("AUDIO_STORE_MAX_BYTES", str(1024 * 1024 * 1024)))  # 1GB
+    AUDIO_PART_MAX_AGE: float = float(os.getenv("AUDIO_PART_MAX_AGE", "3600"))  # unfinished clip writes older than this are deleted on startup
+    TTS_WORKERS: int = int(os.getenv("TTS_WORKERS", "8"))  # shared gTTS segment synthesis pool
+    TTS_SEGMENT_MAX_CHARS: int = int(os.getenv("TTS_SEGMENT_MAX_CHARS", "400"))
+    TTS_BATCH_MAX_ITEMS: int = int(os.getenv("TTS_BATCH_MAX_ITEMS", "100"))
+    TTS_BATCH_CONCURRENCY: int = int(os.getenv("TTS_BATCH_CONCURRENCY", "4"))  # items synthesized at once per batch
+    TTS_STREAM_WINDOW: int = int(os.getenv("TTS_STREAM_WINDOW", "4"))  # segments synthesized ahead per request
+    
+    # Import groq/gTTS/PyPDF2/etc. in the background right after startup instead of on the first request
+    PRELOAD_BACKENDS: bool = os.getenv("PRELOAD_BACKENDS", "true").lower() == "true"
+    
+    # Executor Configuration
+    IO_WORKERS: int = int(os.getenv("IO_WORKERS", "16"))  # network-bound calls (Groq, Wikipedia, gTTS)
+    CPU_WORKERS: int = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 2)))  # PDF/DOCX parsing
+    
+    # Translation Configuration
+    TRANSLATION_MAX_IN_FLIGHT: int = int(os.getenv("TRANSLATION_MAX_IN_FLIGHT", "4"))  # concurrent chunk requests per translation
+    TRANSLATION_BATCH_MAX_IN_FLIGHT: int = int(os.getenv("TRANSLATION_BATCH_MAX_IN_FLIGHT", "8"))  # (chunk, language) pairs per batch
+    TRANSLATION_CHUNK_TOKENS: int = int(os.getenv("TRANSLATION_CHUNK_TOKENS", "1500"))  # max estimated input tokens per chunk
+    GROQ_CONTEXT_TOKENS: int = int(os.getenv("GROQ_CONTEXT_TOKENS", "8192"))  # prompt + completion limit of the model
+    GROQ_MAX_CONCURRENCY: int = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))  # process-wide cap on in-flight Groq calls
+    GROQ_REQUESTS_PER_MINUTE: int = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "0"))  # your Groq plan's RPM; 0 = no limit
+    GROQ_TOKENS_PER_MINUTE: int = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "0"))  # your Groq plan's TPM; 0 = no limit
+    GROQ_COMPLETION_TOKENS_ESTIMATE: int = int(os.getenv("GROQ_COMPLETION_TOKENS_ESTIMATE", "1024"))  # reserved until usage is known
+    GROQ_RATE_LIMIT_RETRIES: int = int(os.getenv("GROQ_RATE_LIMIT_RETRIES", "5"))  # retries on 429, 5xx and connection errors
+    GROQ_BACKOFF_BASE: float = float(os.getenv("GROQ_BACKOFF_BASE", "1.0"))  # seconds, doubled per retry
+    GROQ_BACKOFF_MAX: float = float(os.getenv("GROQ_BACKOFF_MAX", "30.0"))
+    
+    # LLM Backend Configuration
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "groq")  # "groq", or "local" for the offline stand-in (benchmarks, load tests)
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "llama3-70b-8192")
+    LOCAL_LLM_LATENCY: float = float(os.getenv("LOCAL_LLM_LATENCY", "0.5"))  # seconds to the first token
+    LOCAL_LLM_TOKENS_PER_SECOND: float = float(os.getenv("LOCAL_LLM_TOKENS_PER_SECOND", "200"))  # 0 = instant
+    LOCAL_LLM_FAILURE_RATE: float = float(os.getenv("LOCAL_LLM_FAILURE_RATE", "0"))  # fraction of calls that fail
+    LOCAL_LLM_FAILURE_STATUS: int = int(os.getenv("LOCAL_LLM_FAILURE_STATUS", "503"))  # 429 exercises rate-limit handling
+    LOCAL_LLM_SEED: int = int(os.getenv("LOCAL_LLM_SEED", "0"))
+    
+    # Outbound HTTP Configuration (shared keep-alive pools for Wikipedia and Groq)
+    WIKIPEDIA_API_URL: str = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+    HTTP_POOL_HOSTS: int = int(os.getenv("HTTP_POOL_HOSTS", "10"))  # distinct hosts kept in the pool manager
+    HTTP_POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))  # kept-alive connections per host
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+    HTTP_RETRIES: int = int(os.getenv("HTTP_RETRIES", "3"))  # idempotent requests only
+    HTTP_BACKOFF_FACTOR: float = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))  # idle seconds before closing
+    GROQ_HTTP_MAX_CONNECTIONS: int = int(os.getenv("GROQ_HTTP_MAX_CONNECTIONS", "32"))
+    GROQ_TIMEOUT: float = float(os.getenv("GROQ_TIMEOUT", "120"))
+    
+    # Job Queue Configuration
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))
+    JOB_DB_PATH: str = os.getenv("JOB_DB_PATH", os.path.join("data", "jobs.sqlite3"))
+    JOB_CALLBACK_TIMEOUT: float = float(os.getenv("JOB_CALLBACK_TIMEOUT", "10"))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "60"))  # a running job is taken back this long after its worker dies
+    JOB_RETENTION_SECONDS: float = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))  # finished jobs kept 7 days; 0 = forever
+    # Comma-separated hosts callbacks may go to; when empty, any public (non-private, non-loopback) host
+    JOB_CALLBACK_ALLOWED_HOSTS: list = [
+        host.strip().lower() for host in os.getenv("JOB_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+    ]
+    
+    # Cache Configuration
+    CACHE_DIR: str = os.getenv("CACHE_DIR", "cache")
+    WIKI_CACHE_MEMORY_SIZE: int = int(os.getenv("WIKI_CACHE_MEMORY_SIZE", "512"))
+    WIKI_CACHE_TTL: int = int(os.getenv("WIKI_CACHE_TTL", str(7 * 24 * 3600)))  # 7 days
+    WIKI_CACHE_NEGATIVE_TTL: int = int(os.getenv("WIKI_CACHE_NEGATIVE_TTL", str(3600)))  # 1 hour for "no article found"
+    WIKI_CACHE_MAX_BYTES: int = int(os.getenv("WIKI_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 32MB
+    CACHE_PURGE_INTERVAL: float = float(os.getenv("CACHE_PURGE_INTERVAL", "3600"))  # seconds between expired-row sweeps of TTL'd disk caches
+    TRANSLATION_CACHE_MEMORY_SIZE: int = int(os.getenv("TRANSLATION_CACHE_MEMORY_SIZE", "1024"))
+    TRANSLATION_CACHE_MAX_BYTES: int = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+    EXTRACTION_CACHE_MEMORY_SIZE: int = int(os.getenv("EXTRACTION_CACHE_MEMORY_SIZE", "256"))
+    EXTRACTION_CACHE_MAX_BYTES: int = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 32MB
+    SCRIPT_CACHE_ENABLED: bool = os.getenv("SCRIPT_CACHE_ENABLED", "false").lower() == "true"  # opt-in: repeat topics reuse scripts
+    SCRIPT_CACHE_TTL: int = int(os.getenv("SCRIPT_CACHE_TTL", str(24 * 3600)))  # 1 day
+    SCRIPT_CACHE_MEMORY_SIZE: int = int(os.getenv("SCRIPT_CACHE_MEMORY_SIZE", "512"))
+    SCRIPT_CACHE_MAX_BYTES: int = int(os.getenv("SCRIPT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # 32MB
+    
+    # Admin endpoints require this key in the X-Admin-Key header; they answer 404 while it is unset
+    ADMIN_API_KEY: Optional[str] = os.getenv("ADMIN_API_KEY")
 
 settings = Settings()
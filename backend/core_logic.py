@@ -1,39 +1,234 @@
 from dotenv import load_dotenv
 import os
-import wikipediaapi # type: ignore
-from groq import Groq
-import requests
-from gtts import gTTS
-import PyPDF2
-from docx import Document
-from langdetect import detect
 import tempfile
-import wikipedia
 import io
+import codecs
+import hashlib
+import unicodedata
+import importlib
+import time
+from collections import deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import settings
+from services.cache import MISSING, LRUCache, SQLiteCache, TieredCache
+from services.http_session import http_clients
+from services.metrics import track_stage
+from services.chunker import split_by_tokens, split_outer_whitespace
+from services.language_detector import language_detector
+from services.llm_gateway import LLMGateway
+from services.llm_backends import create_backend
+from services import tts_engine
 
 load_dotenv()
 
 # Set API keys
 Groq_API = os.getenv("Groq_API_Key")
-client = Groq(api_key=Groq_API)
 GOOGLE_TRANSLATE_API_KEY = os.getenv("Google_API")
 
+# Heavy backends (groq, requests, PyPDF2, python-docx, langdetect, gTTS) are imported
+# on first use rather than at module load, so the app can answer /health while they warm up
+
+# Every LLM call (scripts, streams, chunk translations from all requests) goes through this gateway:
+# one connection pool, one concurrency cap, the plan's RPM/TPM budget and retries on 429/5xx.
+# LLM_BACKEND picks Groq or the offline stand-in. A missing API key fails the first call, not the import.
+llm_gateway = LLMGateway(
+    partial(create_backend, settings.LLM_BACKEND, Groq_API),
+    max_concurrency=settings.GROQ_MAX_CONCURRENCY,
+    requests_per_minute=settings.GROQ_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.GROQ_TOKENS_PER_MINUTE,
+    completion_tokens_estimate=settings.GROQ_COMPLETION_TOKENS_ESTIMATE,
+    max_retries=settings.GROQ_RATE_LIMIT_RETRIES,
+    backoff_base=settings.GROQ_BACKOFF_BASE,
+    backoff_max=settings.GROQ_BACKOFF_MAX
+)
+
+def preload_backends():
+    """
+    Import the heavy backends ahead of the first request (called in the background at startup)
+    """
+    started = time.perf_counter()
+    for module in ("groq", "requests", "PyPDF2", "docx", "langdetect", "gtts"):
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"⚠️ Could not preload {module}: {str(e)}")
+    llm_gateway.start()
+    print(f"🔥 Backends preloaded in {time.perf_counter() - started:.2f}s")
+
+# Wikipedia summaries keyed by normalized topic; "no article" results are cached for a shorter time
+wikipedia_cache = TieredCache(
+    "wikipedia",
+    LRUCache(settings.WIKI_CACHE_MEMORY_SIZE),
+    SQLiteCache(
+        os.path.join(settings.CACHE_DIR, "wikipedia.sqlite3"),
+        table="summaries",
+        max_bytes=settings.WIKI_CACHE_MAX_BYTES,
+        purge_interval=settings.CACHE_PURGE_INTERVAL
+    ),
+    ttl=settings.WIKI_CACHE_TTL,
+    negative_ttl=settings.WIKI_CACHE_NEGATIVE_TTL
+)
+
+# Chunk translations keyed by (target language, model, temperature, hash of normalized chunk text)
+translation_cache = TieredCache(
+    "translation",
+    LRUCache(settings.TRANSLATION_CACHE_MEMORY_SIZE),
+    SQLiteCache(
+        os.path.join(settings.CACHE_DIR, "translations.sqlite3"),
+        table="chunks",
+        max_bytes=settings.TRANSLATION_CACHE_MAX_BYTES
+    )
+)
+
+# Upload extraction results keyed by SHA-256 of the uploaded bytes (plus extension, which picks the parser)
+extraction_cache = TieredCache(
+    "extraction",
+    LRUCache(settings.EXTRACTION_CACHE_MEMORY_SIZE),
+    SQLiteCache(
+        os.path.join(settings.CACHE_DIR, "extractions.sqlite3"),
+        table="documents",
+        max_bytes=settings.EXTRACTION_CACHE_MAX_BYTES
+    )
+)
+
+# Generated scripts keyed by script type, folded topic, duration, audience level and model (opt-in)
+script_cache = TieredCache(
+    "script",
+    LRUCache(settings.SCRIPT_CACHE_MEMORY_SIZE),
+    SQLiteCache(
+        os.path.join(settings.CACHE_DIR, "scripts.sqlite3"),
+        table="scripts",
+        max_bytes=settings.SCRIPT_CACHE_MAX_BYTES,
+        purge_interval=settings.CACHE_PURGE_INTERVAL
+    ),
+    ttl=settings.SCRIPT_CACHE_TTL
+)
+
+def normalize_topic(topic):
+    """
+    Normalize a topic for cache lookups: collapse whitespace and ignore case
+    """
+    return " ".join(topic.split()).casefold()
+
+def _fold_plural(word):
+    """
+    Crude English singular: "volcanoes" -> "volcano", "batteries" -> "battery", "cells" -> "cell".
+    Only needs to map a plural and its singular to the same key; it never has to be a real word.
+    """
+    if len(word) <= 3 or not word.isascii():
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "sses", "xes", "zes", "oes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def normalize_script_topic(topic):
+    """
+    Topic as the script cache sees it: case, punctuation and spacing ignored, plurals folded,
+    so "Photosynthesis", " photosynthesis! " and "The Volcanoes" / "the volcano" share entries
+    """
+    stripped = "".join(
+        " " if unicodedata.category(char).startswith("P") else char
+        for char in topic.casefold()
+    )
+    return " ".join(_fold_plural(word) for word in stripped.split())
+
+def script_cache_key(script_type, topic, duration, audience_level, model=None):
+    model = model or settings.LLM_MODEL
+    return f"{script_type}|{model}|{audience_level.casefold().strip()}|{duration}|{normalize_script_topic(topic)}"
+
+def cached_script(script_type, topic, duration, audience_level, use_cache, generate):
+    """
+    Return the cached script for these parameters, or generate and store it.
+    use_cache=False (the no_cache request flag) skips the lookup but still refreshes the entry.
+    """
+    if not settings.SCRIPT_CACHE_ENABLED:
+        return generate()
+    
+    key = script_cache_key(script_type, topic, duration, audience_level)
+    if use_cache:
+        script = script_cache.get(key)
+        if script is not MISSING:
+            print(f"📚 Script cache hit for: {topic} ({duration} min, {script_type})")
+            return script
+    
+    script = generate()
+    if script:
+        script_cache.set(key, script)
+    return script
+
 def fetch_wikipedia_summary(topic):
-    wiki_wiki = wikipediaapi.Wikipedia(user_agent="EducationalScriptApp/1.0", language="en")
-    page = wiki_wiki.page(topic)
-    if page.exists():
-        return page.summary
+    key = normalize_topic(topic)
+    cached = wikipedia_cache.get(key)
+    if cached is not MISSING:
+        print(f"📚 Wikipedia cache hit for: {topic}")
+        return cached
+    
+    summary, cacheable = _fetch_wikipedia_summary_uncached(topic)
+    if cacheable:
+        wikipedia_cache.set(key, summary)
+    return summary
+
+def _fetch_wikipedia_summary_uncached(topic):
+    """
+    Returns (summary, cacheable). Search failures are not cached so transient errors don't stick.
+    """
     try:
-        search_results = wikipedia.search(topic, results=3)
-        for related_topic in search_results:
-            page = wiki_wiki.page(related_topic)
-            if page.exists():
-                return page.summary
-        return None
+        summary = query_wikipedia_intros({"titles": topic, "redirects": 1})
+    except Exception as e:
+        print(f"⚠️ Wikipedia lookup failed for {topic}: {str(e)}")
+        return None, False
+    if summary is not None:
+        return summary, True
+    try:
+        # Best of the top 3 search results, extracts fetched in the same request
+        summary = query_wikipedia_intros({
+            "generator": "search",
+            "gsrsearch": topic,
+            "gsrlimit": 3,
+            "redirects": 1
+        })
+        return summary, True
     except:
-        return None
+        return None, False
 
-def generate_script(topic, duration):
+def query_wikipedia_intros(params):
+    """
+    Plain-text intro of the first existing page matched by params (MediaWiki query API), or None.
+    Requests go through the shared keep-alive session.
+    """
+    with track_stage("wikipedia_fetch"):
+        response = http_clients.session.get(
+            settings.WIKIPEDIA_API_URL,
+            params={
+                "action": "query",
+                "prop": "extracts",
+                "exintro": 1,
+                "explaintext": 1,
+                "exlimit": "max",
+                "format": "json",
+                "formatversion": 2,
+                **params
+            },
+            timeout=http_clients.timeout
+        )
+        response.raise_for_status()
+        pages = response.json().get("query", {}).get("pages", [])
+    # Search results carry their rank in "index"; title lookups return a single page
+    pages = sorted(pages, key=lambda page: page.get("index", 0))
+    for page in pages:
+        if not page.get("missing") and not page.get("invalid"):
+            return page.get("extract", "").strip()
+    return None
+
+def build_script_request(topic, duration):
+    """
+    Build the Groq chat completion arguments for a regular educational script
+    """
     factual_content = fetch_wikipedia_summary(topic)
     words_per_minute = 130
     target_words = duration * words_per_minute
@@ -45,21 +240,33 @@ def generate_script(topic, duration):
         # No Wikipedia content, generate a script directly
         prompt = f"Generate an educational script in English on the topic '{topic}' with approximately {target_words} words. Ensure the content is factual, engaging, and suitable for an educational video. Do not include extra text like 'Here is the formatted script' or descriptions."
     
-    response = client.chat.completions.create(
-        messages=[
+    return {
+        "messages": [
             {"role": "system", "content": "You are an AI assistant that creates structured educational scripts. Start directly with the script content, focusing on the topic. Do NOT include introductory phrases, word counts, or metadata."},
             {"role": "user", "content": prompt}
         ],
-        model="llama3-70b-8192"
+        "model": settings.LLM_MODEL
+    }
+
+def generate_script(topic, duration, audience_level="general", use_cache=True):
+    """
+    Generate a regular script, served from the script cache when enabled
+    """
+    return cached_script(
+        "script", topic, duration, audience_level, use_cache,
+        lambda: _generate_script_uncached(topic, duration)
     )
+
+def _generate_script_uncached(topic, duration):
+    request = build_script_request(topic, duration)
+    response = llm_gateway.complete("script", **request)
     
     script = response.choices[0].message.content.strip()
-    script = script.replace("**", "").replace("*", "").replace("###", "").replace("##", "").replace("#", "")
-    return script
+    return clean_markdown(script)
 
-def generate_video_script_direct(topic, duration):
+def build_video_script_request(topic, duration):
     """
-    Generate a video-optimized script directly without first creating a regular script
+    Build the Groq chat completion arguments for a video-optimized script
     """
     factual_content = fetch_wikipedia_summary(topic)
     words_per_minute = 130
@@ -94,128 +301,378 @@ Format the script with:
 
 Do not include extra text like 'Here is the video script' or descriptions."""
     
-    response = client.chat.completions.create(
-        messages=[
+    return {
+        "messages": [
             {"role": "system", "content": "You are an AI assistant specialized in creating video scripts for educational content. Create engaging, visual-friendly scripts with scene descriptions, visual cues, and smooth narration flow. Start directly with the script content."},
             {"role": "user", "content": prompt}
         ],
-        model="llama3-70b-8192",
-        temperature=0.7  # Slightly higher creativity for video content
+        "model": settings.LLM_MODEL,
+        "temperature": 0.7  # Slightly higher creativity for video content
+    }
+
+def generate_video_script_direct(topic, duration, audience_level="general", use_cache=True):
+    """
+    Generate a video-optimized script directly without first creating a regular script.
+    Served from the script cache when enabled.
+    """
+    return cached_script(
+        "video", topic, duration, audience_level, use_cache,
+        lambda: _generate_video_script_uncached(topic, duration)
     )
+
+def _generate_video_script_uncached(topic, duration):
+    request = build_video_script_request(topic, duration)
+    response = llm_gateway.complete("video_script", **request)
     
     video_script = response.choices[0].message.content.strip()
     
     # Clean up formatting but keep video-specific elements like [brackets]
-    video_script = video_script.replace("**", "").replace("*", "").replace("###", "").replace("##", "").replace("#", "")
+    video_script = clean_markdown(video_script)
     
     return video_script
 
+# Characters removed by the markdown cleanup ("**", "*", "###", "##", "#" all reduce to these)
+MARKDOWN_CHARS = str.maketrans("", "", "*#")
+
+def clean_markdown(text):
+    """
+    Remove markdown emphasis and heading marks; same result as replacing "**", "*", "###", "##", "#" in turn.
+    str.translate is the fastest single pass on ASCII text but has no fast path for other scripts
+    (Urdu, Hindi, ...), where two replace passes win by an order of magnitude.
+    """
+    if text.isascii():
+        return text.translate(MARKDOWN_CHARS)
+    return text.replace("*", "").replace("#", "")
+
+class MarkdownStripper:
+    """
+    Incremental version of the script cleanup for streamed tokens.
+    Produces exactly what .strip() followed by the markdown replace chain gives on the full text:
+    leading whitespace is skipped and trailing whitespace is held back until more text arrives.
+    """
+    def __init__(self):
+        self.started = False
+        self.pending = ""
+    
+    def feed(self, text):
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self.started = True
+        
+        body = text.rstrip()
+        if not body:
+            self.pending += text
+            return ""
+        
+        out = self.pending + body
+        self.pending = text[len(body):]
+        return clean_markdown(out)
+
+def stream_script(topic, duration):
+    """
+    Stream a regular script as cleaned text deltas
+    """
+    yield from _stream_completion(build_script_request(topic, duration))
+
+def stream_video_script(topic, duration):
+    """
+    Stream a video-optimized script as cleaned text deltas
+    """
+    yield from _stream_completion(build_video_script_request(topic, duration))
+
+def _stream_completion(request):
+    stripper = MarkdownStripper()
+    # Measured from the request until the last token (or until the client goes away)
+    with track_stage("groq_stream"):
+        stream = llm_gateway.stream("script_stream", **request)
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    cleaned = stripper.feed(delta)
+                    if cleaned:
+                        yield cleaned
+        finally:
+            stream.close()  # an abandoned stream cancels the upstream request
+    # Trailing whitespace still pending in the stripper is dropped, matching .strip()
+
 def generate_video_script(script_content):
     """
     Legacy function - converts existing script to video format
     This is kept for backward compatibility but not used in the new flow
     """
-    response = client.chat.completions.create(
+    response = llm_gateway.complete(
+        "legacy_video_script",
         messages=[
             {"role": "system", "content": "You are an AI assistant that converts educational text into video scene descriptions."},
             {"role": "user", "content": f"Convert this script into a video script with scene descriptions:\n\n{script_content}"}
         ],
-        model="llama3-70b-8192"
+        model=settings.LLM_MODEL
     )
     return response.choices[0].message.content.strip()
 
-def translate_script(script_content, target_language):
+# Language mapping for Google Translate API and gTTS
+LANGUAGE_CODES = {
+    "english": "en",
+    "chinese-simplified": "zh-cn",
+    "chinese-traditional": "zh-tw", 
+    "spanish": "es",
+    "french": "fr",
+    "german": "de",
+    "italian": "it",
+    "japanese": "ja",
+    "turkish": "tr",
+    "russian": "ru",
+    "urdu": "ur",  # Added Urdu
+    "arabic": "ar",
+    "hindi": "hi",
+    "portuguese": "pt",
+    "korean": "ko"
+}
+
+def tts_language_code(language):
+    """
+    gTTS code for a language given by API name ("spanish") or code ("es", "zh-CN");
+    raises ValueError for languages gTTS can't speak
+    """
+    code = LANGUAGE_CODES.get(language.strip().lower(), language.strip().lower())
+    from gtts.lang import tts_langs
+    supported = {supported.lower(): supported for supported in tts_langs()}
+    if code not in supported:
+        raise ValueError(f"Unsupported language: {language}")
+    return supported[code]
+
+def translate_script(script_content, target_language, progress=None):
     """
-    Translate script using multiple methods - Google API with fallback to Groq AI
+    Translate script using multiple methods - Google API with fallback to Groq AI.
+    progress, if given, is called with (chunks_done, total_chunks).
     """
     if not script_content:
         return "⚠️ No valid script content to translate."
     
-    # Language mapping for Google Translate API
-    language_map = {
-        "chinese-simplified": "zh-cn",
-        "chinese-traditional": "zh-tw", 
-        "spanish": "es",
-        "french": "fr",
-        "german": "de",
-        "italian": "it",
-        "japanese": "ja",
-        "turkish": "tr",
-        "russian": "ru",
-        "urdu": "ur",  # Added Urdu
-        "arabic": "ar",
-        "hindi": "hi",
-        "portuguese": "pt",
-        "korean": "ko"
-    }
-    
-    google_lang_code = language_map.get(target_language, target_language)
+    google_lang_code = LANGUAGE_CODES.get(target_language, target_language)
     
     # Skip Google API for now and go directly to Groq AI (more reliable)
     print(f"🤖 Using Groq AI translation for {target_language}")
     
     try:
-        return translate_with_groq_ai(script_content, target_language)
+        return translate_with_groq_ai(script_content, target_language, progress)
     except Exception as e:
         print(f"❌ Groq AI translation failed: {str(e)}")
         return f"❌ Translation failed for {target_language}. Please try again later."
 
-def translate_with_groq_ai(script_content, target_language):
+# Language mapping for human-readable names
+LANGUAGE_NAMES = {
+    "chinese-simplified": "Chinese (Simplified)",
+    "chinese-traditional": "Chinese (Traditional)",
+    "spanish": "Spanish",
+    "french": "French", 
+    "german": "German",
+    "italian": "Italian",
+    "japanese": "Japanese",
+    "turkish": "Turkish",
+    "russian": "Russian",
+    "urdu": "Urdu",  # Added Urdu
+    "arabic": "Arabic",
+    "hindi": "Hindi",
+    "portuguese": "Portuguese",
+    "korean": "Korean"
+}
+
+def language_display_name(target_language):
+    return LANGUAGE_NAMES.get(target_language, target_language.title())
+
+# Rough ratio of output to input tokens when translating English into each language;
+# non-Latin scripts take several times more tokens per word
+TRANSLATION_TOKEN_EXPANSION = {
+    "chinese-simplified": 1.5,
+    "chinese-traditional": 1.7,
+    "spanish": 1.5,
+    "french": 1.5,
+    "german": 1.5,
+    "italian": 1.5,
+    "portuguese": 1.5,
+    "turkish": 2.0,
+    "japanese": 2.0,
+    "russian": 2.5,
+    "korean": 2.5,
+    "arabic": 3.0,
+    "urdu": 3.5,
+    "hindi": 3.5
+}
+DEFAULT_TOKEN_EXPANSION = 2.0
+TRANSLATION_PROMPT_TOKENS = 150  # system prompt and instructions around each chunk
+
+def translation_token_budget(target_languages):
+    """
+    Largest chunk, in estimated tokens, whose prompt and translated output still fit the model
+    context for every target language, capped at TRANSLATION_CHUNK_TOKENS
+    """
+    budget = settings.TRANSLATION_CHUNK_TOKENS
+    for target_language in target_languages:
+        expansion = TRANSLATION_TOKEN_EXPANSION.get(target_language, DEFAULT_TOKEN_EXPANSION)
+        budget = min(budget, int((settings.GROQ_CONTEXT_TOKENS - TRANSLATION_PROMPT_TOKENS) / (1 + expansion)))
+    return max(1, budget)
+
+def split_for_translation(script_content, target_languages):
+    """
+    Chunks within the token budget (exact slices of the text) and the stripped bodies sent to Groq
+    """
+    chunks = split_by_tokens(script_content, translation_token_budget(target_languages)) or [script_content]
+    return chunks, [split_outer_whitespace(chunk)[1] for chunk in chunks]
+
+def translate_with_groq_ai(script_content, target_language, progress=None):
     """
     Translate using Groq AI as primary method
     """
-    # Language mapping for human-readable names
-    language_names = {
-        "chinese-simplified": "Chinese (Simplified)",
-        "chinese-traditional": "Chinese (Traditional)",
-        "spanish": "Spanish",
-        "french": "French", 
-        "german": "German",
-        "italian": "Italian",
-        "japanese": "Japanese",
-        "turkish": "Turkish",
-        "russian": "Russian",
-        "urdu": "Urdu",  # Added Urdu
-        "arabic": "Arabic",
-        "hindi": "Hindi",
-        "portuguese": "Portuguese",
-        "korean": "Korean"
-    }
+    target_lang_name = language_display_name(target_language)
     
-    target_lang_name = language_names.get(target_language, target_language.title())
+    # Split long content into chunks that fit the model's token limits
+    chunks, bodies = split_for_translation(script_content, [target_language])
     
-    # Split long content into chunks for better translation
-    chunks = split_text_into_chunks(script_content, max_length=2000)
-    translated_chunks = []
+    if len(chunks) == 1:
+        translated_chunks = [translate_chunk(bodies[0], target_lang_name, 1, 1)]
+        if progress:
+            progress(1, 1)
+    else:
+        # Translate chunks concurrently; results are collected in submission order
+        max_in_flight = max(1, min(settings.TRANSLATION_MAX_IN_FLIGHT, len(chunks)))
+        executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="translate")
+        try:
+            futures = [
+                executor.submit(translate_chunk, body, target_lang_name, i + 1, len(chunks))
+                for i, body in enumerate(bodies)
+            ]
+            translated_chunks = []
+            for future in futures:
+                translated_chunks.append(future.result())
+                if progress:
+                    progress(len(translated_chunks), len(chunks))
+        finally:
+            # On failure, drop chunks that haven't started yet
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    return assemble_translation(chunks, translated_chunks, target_lang_name)
+
+def assemble_translation(chunks, translated_chunks, target_lang_name):
+    # Put each translation back between the whitespace that surrounded its chunk (paragraph breaks etc.)
+    parts = []
+    for chunk, translated_chunk in zip(chunks, translated_chunks):
+        leading, _, trailing = split_outer_whitespace(chunk)
+        parts.append(leading + translated_chunk + trailing)
+    full_translation = "".join(parts).strip()
     
-    for i, chunk in enumerate(chunks):
-        print(f"🔄 Translating chunk {i+1}/{len(chunks)} to {target_lang_name}")
+    # Add a note that this was AI translated
+    full_translation += f"\n\n---\n*Translated to {target_lang_name} using AI*"
+    
+    return full_translation
+
+def translate_to_languages(script_content, target_languages):
+    """
+    Translate one script into several languages. The text is chunked once and every
+    (chunk, language) pair is scheduled on one bounded pool. Yields (language, translation, error)
+    as soon as each language's chunks are all done, so fast languages aren't held up by slow ones.
+    """
+    chunks, bodies = split_for_translation(script_content, target_languages)
+    total = len(chunks)
+    remaining = {}
+    translated = {}
+    failed = set()
+    
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(settings.TRANSLATION_BATCH_MAX_IN_FLIGHT, total * len(target_languages))),
+        thread_name_prefix="translate-batch"
+    )
+    try:
+        futures = {}
+        # Language by language, so the first languages finish (and stream back) first
+        for target_language in target_languages:
+            target_lang_name = language_display_name(target_language)
+            remaining[target_language] = total
+            translated[target_language] = [None] * total
+            for i, body in enumerate(bodies):
+                future = executor.submit(translate_chunk, body, target_lang_name, i + 1, total)
+                futures[future] = (target_language, i)
         
-        prompt = f"""Translate the following educational script from English to {target_lang_name}. 
+        for future in as_completed(futures):
+            target_language, i = futures[future]
+            if target_language in failed or future.cancelled():
+                continue
+            
+            try:
+                translated[target_language][i] = future.result()
+            except Exception as e:
+                print(f"❌ Groq AI translation failed: {str(e)}")
+                failed.add(target_language)
+                # Skip the rest of this language's chunks that haven't started
+                for other, (language, _) in futures.items():
+                    if language == target_language:
+                        other.cancel()
+                yield target_language, None, f"❌ Translation failed for {target_language}. Please try again later."
+                continue
+            
+            remaining[target_language] -= 1
+            if remaining[target_language] == 0:
+                translation = assemble_translation(
+                    chunks, translated.pop(target_language), language_display_name(target_language)
+                )
+                yield target_language, translation, None
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def normalize_chunk(chunk):
+    """
+    Normalize chunk text for cache keys: unicode form, line endings and trailing whitespace
+    """
+    chunk = unicodedata.normalize("NFC", chunk).replace("\r\n", "\n")
+    return "\n".join(line.rstrip() for line in chunk.strip().split("\n"))
+
+def translation_cache_key(chunk, target_lang_name, model, temperature):
+    digest = hashlib.sha256(normalize_chunk(chunk).encode("utf-8")).hexdigest()
+    # Language first so an admin purge can target one language by prefix
+    return f"{target_lang_name}|{model}|{temperature}|{digest}"
+
+def translate_chunk(chunk, target_lang_name, index=1, total=1):
+    """
+    Translate a single chunk of text with Groq AI, reusing cached translations of identical chunks
+    """
+    if not chunk.strip():
+        return ""  # whitespace between chunks is kept by assemble_translation
+    
+    model = settings.LLM_MODEL
+    temperature = 0.3  # Lower temperature for more consistent translation
+    cache_key = translation_cache_key(chunk, target_lang_name, model, temperature)
+    cached = translation_cache.get(cache_key)
+    if cached is not MISSING:
+        print(f"📚 Chunk {index}/{total} served from translation cache ({target_lang_name})")
+        return cached
+    
+    print(f"🔄 Translating chunk {index}/{total} to {target_lang_name}")
+    
+    prompt = f"""Translate the following educational script from English to {target_lang_name}. 
         Maintain the educational tone, structure, and formatting. Provide only the translation without any additional text or explanations.
 
         Text to translate:
         {chunk}"""
-        
-        response = client.chat.completions.create(
+    
+    with track_stage("chunk_translation"):
+        response = llm_gateway.complete(
+            "translation",
             messages=[
                 {"role": "system", "content": f"You are a professional translator specializing in educational content. Translate accurately to {target_lang_name} while maintaining the original structure and educational tone. Provide only the translation."},
                 {"role": "user", "content": prompt}
             ],
-            model="llama3-70b-8192",
-            temperature=0.3  # Lower temperature for more consistent translation
+            model=model,
+            temperature=temperature
         )
-        
-        translated_chunk = response.choices[0].message.content.strip()
-        translated_chunks.append(translated_chunk)
-    
-    # Join all translated chunks
-    full_translation = "\n\n".join(translated_chunks)
-    
-    # Add a note that this was AI translated
-    full_translation += f"\n\n---\n*Translated to {target_lang_name} using AI*"
     
-    return full_translation
+    translated_chunk = response.choices[0].message.content.strip()
+    translation_cache.set(cache_key, translated_chunk)
+    return translated_chunk
 
 def split_text_into_chunks(text, max_length=2000):
     """
@@ -224,115 +681,306 @@ def split_text_into_chunks(text, max_length=2000):
     if len(text) <= max_length:
         return [text]
     
+    # Paragraphs are separated by "\n\n", so a run of whole paragraphs is a plain slice of the text.
+    # Track the current chunk as offsets rather than building strings: one slice per chunk, linear time.
     chunks = []
-    paragraphs = text.split('\n\n')
-    current_chunk = ""
+    start = None  # offset of the current chunk's first paragraph
+    end = 0  # offset just past its last paragraph
+    position = 0
     
-    for paragraph in paragraphs:
-        if len(current_chunk + paragraph) <= max_length:
-            current_chunk += paragraph + "\n\n"
+    while True:
+        separator = text.find("\n\n", position)
+        paragraph_end = separator if separator != -1 else len(text)
+        # Each paragraph in a chunk counts with its trailing "\n\n"
+        current_length = end - start + 2 if start is not None else 0
+        if current_length + paragraph_end - position <= max_length:
+            if start is None:
+                start = position
+            end = paragraph_end
         else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = paragraph + "\n\n"
+            if start is not None:
+                chunks.append(text[start:end].strip())
+            start, end = position, paragraph_end
+        if separator == -1:
+            break
+        position = separator + 2
     
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    if start is not None:
+        chunks.append(text[start:end].strip())
     
     return chunks
 
+def count_words(text, window=16384):
+    """
+    Same as len(text.split()), without materializing a list of every word in a long text:
+    the text is split a window at a time and words straddling two windows are counted once.
+    """
+    if len(text) <= window:
+        return len(text.split())
+    counter = WordCounter()
+    for start in range(0, len(text), window):
+        counter.feed(text[start:start + window])
+    return counter.count
+
+class WordCounter:
+    """
+    Incremental len(text.split()) over consecutive pieces of one text
+    """
+    def __init__(self):
+        self.count = 0
+        self.ends_in_word = False
+    
+    def feed(self, piece):
+        if not piece:
+            return
+        # A word split across two pieces must only be counted once
+        words = len(piece.split())
+        if self.ends_in_word and not piece[0].isspace():
+            words -= 1
+        self.count += words
+        self.ends_in_word = not piece[-1].isspace()
+
+def resolve_extension(filename, content_type):
+    """
+    Get the file extension from the filename, falling back to the content type
+    """
+    if filename:
+        return os.path.splitext(filename)[1].lower()
+    if content_type == "text/plain":
+        return ".txt"
+    elif content_type == "application/pdf":
+        return ".pdf"
+    elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        return ".docx"
+    return ".txt"  # Default fallback
+
+def iter_text_from_file(file_obj, extension, chunk_size=64 * 1024):
+    """
+    Yield the text of a seekable binary file piece by piece (page, paragraph or decoded block).
+    Joining the pieces and stripping gives the extracted text.
+    """
+    if extension == ".pdf":
+        import PyPDF2
+        yield from _iter_pdf_text(PyPDF2.PdfReader(file_obj))
+    
+    elif extension == ".docx":
+        from docx import Document
+        doc = Document(file_obj)
+        for para in doc.paragraphs:
+            yield para.text + "\n"
+    
+    else:
+        # Text files: UTF-8, falling back to Latin-1 (.txt) or dropping undecodable bytes (unknown types).
+        # Validate the whole file first so a late decode error can't leave half-decoded output behind.
+        fallback = ("latin-1", "strict") if extension == ".txt" else ("utf-8", "ignore")
+        start = file_obj.tell()
+        encoding, errors = "utf-8", "strict"
+        try:
+            for _ in _iter_decoded(file_obj, "utf-8", "strict", chunk_size):
+                pass
+        except UnicodeDecodeError:
+            encoding, errors = fallback
+        file_obj.seek(start)
+        yield from _iter_decoded(file_obj, encoding, errors, chunk_size)
+
+def _iter_pdf_text(reader):
+    for page in reader.pages:
+        yield page.extract_text() + "\n"
+
+def _iter_decoded(file_obj, encoding, errors, chunk_size):
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    while True:
+        block = file_obj.read(chunk_size)
+        if not block:
+            break
+        text = decoder.decode(block)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+def _extraction_error(extension, error):
+    if extension == ".pdf":
+        print(f"⚠️ PDF extraction error: {str(error)}")
+        return f"Error extracting PDF content: {str(error)}"
+    if extension == ".docx":
+        print(f"⚠️ DOCX extraction error: {str(error)}")
+        return f"Error extracting DOCX content: {str(error)}"
+    print(f"❌ Text extraction error: {str(error)}")
+    return f"Error extracting text: {str(error)}"
+
 def extract_text_from_file(file_content, filename, content_type):
     """
     Extract text from different file types using file content and metadata
     """
+    extension = resolve_extension(filename, content_type)
+    print(f"📄 Processing file with extension: {extension}")
     try:
-        # Get file extension from filename
-        if filename:
-            extension = os.path.splitext(filename)[1].lower()
-        else:
-            # Fallback to content type
-            if content_type == "text/plain":
-                extension = ".txt"
-            elif content_type == "application/pdf":
-                extension = ".pdf"
-            elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                extension = ".docx"
+        text = "".join(iter_text_from_file(io.BytesIO(file_content), extension))
+        return text.strip() if extension in (".pdf", ".docx") else text
+    except Exception as e:
+        return _extraction_error(extension, e)
+
+def summarize_document(path, filename, content_type, preview_chars=1000, sample_chars=10000,
+                       parallel_min_pages=None):
+    """
+    Extract text from a file on disk without holding the whole text in memory.
+    Returns word count, the response preview, a leading sample for language detection
+    and an error message (None on success).
+    A PDF with at least parallel_min_pages pages is left unextracted and only
+    {"page_count": n} is returned, for the caller to pass to summarize_pdf_parallel.
+    """
+    extension = resolve_extension(filename, content_type)
+    print(f"📄 Processing file with extension: {extension}")
+    summary = TextSummary(preview_chars, sample_chars)
+    try:
+        with open(path, "rb") as f:
+            if extension == ".pdf" and parallel_min_pages is not None:
+                # Parse once: the page count comes from the same reader the small-PDF path extracts with
+                import PyPDF2
+                reader = PyPDF2.PdfReader(f)
+                if len(reader.pages) >= parallel_min_pages:
+                    return {"page_count": len(reader.pages)}
+                pieces = _iter_pdf_text(reader)
             else:
-                extension = ".txt"  # Default fallback
-        
-        print(f"📄 Processing file with extension: {extension}")
+                pieces = iter_text_from_file(f, extension)
+            for piece in pieces:
+                summary.feed(piece)
+    except Exception as e:
+        return {"error": _extraction_error(extension, e), "word_count": 0, "preview": "", "sample": ""}
+    return {"error": None, **summary.result()}
+
+def extract_pdf_page_range(path, start, end):
+    """
+    Extract pages [start, end) of a PDF; run in a worker process, one call per range
+    """
+    import PyPDF2
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[i].extract_text() + "\n" for i in range(start, end)]
+
+def summarize_pdf_parallel(path, page_count, submit, pages_per_range=16, max_in_flight=4,
+                           preview_chars=1000, sample_chars=10000):
+    """
+    summarize_document for large PDFs: page ranges are extracted concurrently through submit
+    (a process pool) and fed to the summary in page order. At most max_in_flight ranges are
+    outstanding, which bounds memory.
+    """
+    ranges = iter([
+        (start, min(start + pages_per_range, page_count))
+        for start in range(0, page_count, pages_per_range)
+    ])
+    summary = TextSummary(preview_chars, sample_chars)
+    pending = deque()
+    print(f"📄 Extracting {page_count} PDF pages in ranges of {pages_per_range}")
+    
+    try:
+        for page_range in ranges:
+            pending.append(submit(extract_pdf_page_range, path, *page_range))
+            if len(pending) >= max_in_flight:
+                break
         
-        if extension == ".txt":
-            # Handle text files
-            try:
-                return file_content.decode("utf-8")
-            except UnicodeDecodeError:
-                try:
-                    return file_content.decode("latin-1")
-                except UnicodeDecodeError:
-                    return file_content.decode("utf-8", errors="ignore")
+        while pending:
+            pages = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range is not None:
+                pending.append(submit(extract_pdf_page_range, path, *next_range))
+            for page_text in pages:
+                summary.feed(page_text)
+    except Exception as e:
+        for future in pending:
+            future.cancel()
+        return {"error": _extraction_error(".pdf", e), "word_count": 0, "preview": "", "sample": ""}
+    
+    return {"error": None, **summary.result()}
+
+class TextSummary:
+    """
+    Incrementally computes what the upload endpoint reports for text.strip():
+    word count, a preview of preview_chars (+ "..." when longer) and a leading sample.
+    """
+    def __init__(self, preview_chars=1000, sample_chars=10000):
+        self.preview_chars = preview_chars
+        self.sample_chars = max(sample_chars, preview_chars)
+        self.words = WordCounter()
+        self.head = []
+        self.head_length = 0
+        self.length = 0
+        self.has_more = False
+        self.started = False
+    
+    def feed(self, piece):
+        if not piece:
+            return
+        if not self.started:
+            piece = piece.lstrip()
+            if not piece:
+                return
+            self.started = True
         
-        elif extension == ".pdf":
-            # Handle PDF files
-            try:
-                pdf_file = io.BytesIO(file_content)
-                reader = PyPDF2.PdfReader(pdf_file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-            except Exception as e:
-                print(f"⚠️ PDF extraction error: {str(e)}")
-                return f"Error extracting PDF content: {str(e)}"
+        self.words.feed(piece)
         
-        elif extension == ".docx":
-            # Handle DOCX files
-            try:
-                docx_file = io.BytesIO(file_content)
-                doc = Document(docx_file)
-                text = ""
-                for para in doc.paragraphs:
-                    text += para.text + "\n"
-                return text.strip()
-            except Exception as e:
-                print(f"⚠️ DOCX extraction error: {str(e)}")
-                return f"Error extracting DOCX content: {str(e)}"
+        # The stripped text is longer than the preview iff non-whitespace follows the first preview_chars
+        if not self.has_more and self.length + len(piece) > self.preview_chars:
+            self.has_more = bool(piece[max(0, self.preview_chars - self.length):].strip())
+        self.length += len(piece)
         
+        if self.head_length < self.sample_chars:
+            kept = piece[:self.sample_chars - self.head_length]
+            self.head.append(kept)
+            self.head_length += len(kept)
+    
+    def result(self):
+        head = "".join(self.head)
+        if self.has_more:
+            preview = head[:self.preview_chars] + "..."
         else:
-            # Fallback for unknown file types
-            try:
-                return file_content.decode("utf-8")
-            except UnicodeDecodeError:
-                return file_content.decode("utf-8", errors="ignore")
-                
-    except Exception as e:
-        print(f"❌ Text extraction error: {str(e)}")
-        return f"Error extracting text: {str(e)}"
+            preview = head[:self.preview_chars].rstrip()
+        return {
+            "word_count": self.words.count,
+            "preview": preview,
+            "sample": head.rstrip()
+        }
+
+def detect_language(text_content):
+    """
+    Detect the language code of the text, defaulting to English.
+    Long texts are sampled and results are memoized (see services/language_detector.py).
+    Also runs in CPU pool workers, so it takes no metrics locks; callers time the langdetect stage.
+    """
+    try:
+        language = language_detector.detect(text_content)
+        print(f"🔍 Detected language: {language}")
+    except Exception:
+        language = "en"  # Default to English
+        print("⚠️ Language detection failed, using English")
+    return language
 
-def text_to_speech_from_content(text_content):
+def detect_languages(texts):
     """
-    Convert text content directly to speech and return audio data
+    detect_language for a batch of texts in one call (run in a CPU pool worker, untimed like detect_language)
+    """
+    try:
+        return language_detector.detect_batch(texts)
+    except Exception:
+        print("⚠️ Language detection failed, using English")
+        return ["en"] * len(texts)
+
+def text_to_speech_from_content(text_content, language=None):
+    """
+    Convert text content directly to speech and return audio data.
+    The language is detected from the text unless given.
     """
     try:
         if not text_content.strip():
             return "No text found.", None
             
-        # Detect language
-        try:
-            language = detect(text_content)
-            print(f"🔍 Detected language: {language}")
-        except:
-            language = "en"  # Default to English
-            print("⚠️ Language detection failed, using English")
-        
-        # Generate TTS
-        tts = gTTS(text=text_content, lang=language, slow=False)
+        if language is None:
+            language = detect_language(text_content)
         
-        # Save to BytesIO instead of file
-        audio_buffer = io.BytesIO()
-        tts.write_to_fp(audio_buffer)
-        audio_buffer.seek(0)
-        audio_data = audio_buffer.read()
+        # Generate TTS, sentence segments synthesized in parallel
+        audio_data = tts_engine.synthesize(text_content, language)
         
         print(f"✅ TTS generated: {len(audio_data)} bytes")
         
@@ -359,9 +1007,11 @@ def extract_text(file):
                 return content.decode("utf-8")
             return content
         elif extension == ".pdf":
+            import PyPDF2
             reader = PyPDF2.PdfReader(file)
             return "".join(page.extract_text() for page in reader.pages)
         elif extension == ".docx":
+            from docx import Document
             doc = Document(file)
             return "\n".join(para.text for para in doc.paragraphs)
         else:
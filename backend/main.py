@@ -1,21 +1,55 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
+import asyncio
+import contextlib
+import time
 import tempfile
 import io
 import os
-import uuid
+import json
+import hashlib
+import hmac
+import shutil
 from core_logic import (
     generate_script, 
     generate_video_script_direct,  # New function for direct video script generation
+    stream_script,
+    stream_video_script,
     translate_script, 
+    translate_to_languages,
     text_to_speech,
-    extract_text_from_file,
-    text_to_speech_from_content
+    summarize_document,
+    summarize_pdf_parallel,
+    resolve_extension,
+    detect_language,
+    detect_languages,
+    tts_language_code,
+    wikipedia_cache,
+    translation_cache,
+    extraction_cache,
+    script_cache,
+    llm_gateway,
+    language_display_name,
+    preload_backends,
+    count_words,
+    WordCounter
 )
+from config import settings
+from services.cache import MISSING
+from services.tts_engine import synthesize_stream, split_sentences, tts_pool
+from services.audio_store import audio_store, audio_key
+from services.job_queue import JobQueue
+from services.executor import run_io, run_cpu, iterate_io, io_pool, cpu_pool, executor_stats, shutdown_executors
+from services.http_session import http_clients
+from services.language_detector import language_detector
+from services.single_flight import SingleFlight, single_flight_stats
+from services.metrics import registry, track_stage, MetricsMiddleware
+from services.upload_limit import UploadSizeLimitMiddleware
 
 app = FastAPI(
     title="EduAI Pro API",
@@ -24,11 +58,58 @@ app = FastAPI(
 )
 
 # Create directories for storing files
-os.makedirs("audio_files", exist_ok=True)
+os.makedirs(settings.AUDIO_OUTPUT_DIR, exist_ok=True)
 os.makedirs("uploads", exist_ok=True)
 
+# Long-running work submitted through the /jobs endpoints
+job_queue = JobQueue(
+    settings.JOB_DB_PATH,
+    settings.JOB_WORKERS,
+    callback_timeout=settings.JOB_CALLBACK_TIMEOUT,
+    callback_allowed_hosts=settings.JOB_CALLBACK_ALLOWED_HOSTS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    retention_seconds=settings.JOB_RETENTION_SECONDS
+)
+
+# Identical requests in flight together (a class pressing "Generate" on the same topic) share one upstream call
+generate_script_flight = SingleFlight(generate_script)
+generate_video_script_flight = SingleFlight(generate_video_script_direct)
+translate_script_flight = SingleFlight(translate_script)
+
+def _open_stores():
+    """Open the on-disk caches and reconcile the audio index, so their totals are known before first use"""
+    for cache in (wikipedia_cache, translation_cache, extraction_cache, script_cache):
+        cache.disk.open()
+    audio_store.open()
+
+@app.on_event("startup")
+async def startup_event():
+    if settings.PRELOAD_BACKENDS:
+        # Fire and forget: /health answers while the heavy imports load
+        io_pool.submit(preload_backends)
+    # Also fire and forget: /health and /metrics only read in-memory totals, never open the stores
+    io_pool.submit(_open_stores)
+    resumed = await run_io(job_queue.resume)
+    if resumed:
+        print(f"⚙️ Resumed {resumed} unfinished jobs")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    job_queue.shutdown()
+    shutdown_executors()
+    llm_gateway.close()
+    http_clients.close()
+
 # Mount static files for audio serving
-app.mount("/audio", StaticFiles(directory="audio_files"), name="audio")
+app.mount("/audio", StaticFiles(directory=settings.AUDIO_OUTPUT_DIR), name="audio")
+
+# Reject oversized uploads while they arrive, before FastAPI parses (and spools) the multipart form
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=["/upload-document"],
+    max_bytes=settings.MAX_FILE_SIZE + settings.UPLOAD_FORM_OVERHEAD,
+    detail=f"File too large (max {settings.MAX_FILE_SIZE // (1024 * 1024)}MB)"
+)
 
 # CORS middleware for React frontend
 app.add_middleware(
@@ -44,8 +125,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Store audio files temporarily (in production, use proper storage)
-audio_storage = {}
+# Request counts and latency per route, served on /metrics
+app.add_middleware(MetricsMiddleware)
 
 # Pydantic models
 class ScriptRequest(BaseModel):
@@ -53,12 +134,14 @@ class ScriptRequest(BaseModel):
     duration: int
     audience_level: str = "general"
     language: str = "english"
+    no_cache: bool = False  # bypass the script cache and generate afresh
 
 class VideoScriptRequest(BaseModel):
     topic: str
     duration: int
     audience_level: str = "general"
     language: str = "english"
+    no_cache: bool = False  # bypass the script cache and generate afresh
 
 class TranslationRequest(BaseModel):
     text: str
@@ -72,6 +155,42 @@ class TextToSpeechRequest(BaseModel):
     pitch: int = 0
     language: str = "en"
 
+class BatchTranslationRequest(BaseModel):
+    text: str
+    target_languages: List[str]
+    source_language: str = "auto"
+
+class BatchTextToSpeechItem(BaseModel):
+    text: str
+    language: Optional[str] = None  # "spanish" or a gTTS code like "es"; detected from the text when omitted
+
+class BatchTextToSpeechRequest(BaseModel):
+    items: List[BatchTextToSpeechItem]
+    voice_type: str = "female"
+    speed: float = 1.0
+
+class PipelineRequest(BaseModel):
+    topic: str
+    duration: int
+    target_languages: List[str] = []
+    audience_level: str = "general"
+    no_cache: bool = False
+    include_source_audio: bool = True
+    voice_type: str = "female"
+    speed: float = 1.0
+
+class ScriptJobRequest(ScriptRequest):
+    callback_url: Optional[str] = None
+
+class VideoScriptJobRequest(VideoScriptRequest):
+    callback_url: Optional[str] = None
+
+class TranslationJobRequest(TranslationRequest):
+    callback_url: Optional[str] = None
+
+class TextToSpeechJobRequest(TextToSpeechRequest):
+    callback_url: Optional[str] = None
+
 # API Endpoints
 @app.get("/")
 async def root():
@@ -82,10 +201,18 @@ async def root():
         "endpoints": {
             "script_generation": "/generate-script",
             "video_script": "/generate-video-script", 
+            "script_stream": "/generate-script/stream",
+            "video_script_stream": "/generate-video-script/stream",
             "translation": "/translate-script",
+            "translation_batch": "/translate-script/batch",
             "text_to_speech": "/text-to-speech",
+            "text_to_speech_stream": "/text-to-speech/stream",
+            "text_to_speech_batch": "/text-to-speech/batch",
             "document_upload": "/upload-document",
-            "health_check": "/health"
+            "jobs": "/jobs/{job_id}",
+            "pipeline": "/pipeline",
+            "health_check": "/health",
+            "metrics": "/metrics"
         }
     }
 
@@ -95,8 +222,78 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "service": "EduAI Pro API",
-        "message": "Backend is running smoothly! 🚀"
+        "message": "Backend is running smoothly! 🚀",
+        "executors": {**executor_stats(), "tts": tts_pool.stats()},
+        "jobs": job_queue.stats(),
+        "http": http_clients.stats(),
+        "llm": llm_gateway.stats(),
+        "coalescing": single_flight_stats(),
+        "caches": {
+            "wikipedia": wikipedia_cache.stats(),
+            "translation": translation_cache.stats(),
+            "extraction": extraction_cache.stats(),
+            "script": script_cache.stats(),
+            "audio": audio_store.stats(),
+            "langdetect": language_detector.stats()
+        }
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus text exposition: per-endpoint request histograms, pipeline stage histograms,
+    and pool/cache/HTTP client counters
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+def _runtime_metrics():
+    """
+    Pool, cache and outbound HTTP figures, read from the same stats /health reports
+    """
+    pools = {**executor_stats(), "tts": tts_pool.stats(), "jobs": job_queue.pool.stats()}
+    yield ("eduai_pool_active_workers", "gauge", "Busy workers per pool",
+           [({"pool": name}, stats["active"]) for name, stats in pools.items()])
+    yield ("eduai_pool_queue_depth", "gauge", "Tasks waiting for a worker per pool",
+           [({"pool": name}, stats["queue_depth"]) for name, stats in pools.items()])
+    yield ("eduai_pool_tasks_failed_total", "counter", "Tasks that raised per pool",
+           [({"pool": name}, stats["failed"]) for name, stats in pools.items()])
+    
+    caches = {
+        "wikipedia": wikipedia_cache.stats(),
+        "translation": translation_cache.stats(),
+        "extraction": extraction_cache.stats(),
+        "script": script_cache.stats()
     }
+    hits = []
+    misses = []
+    for name, stats in caches.items():
+        hits.append(({"cache": name, "tier": "memory"}, stats["memory_hits"]))
+        hits.append(({"cache": name, "tier": "disk"}, stats["disk_hits"]))
+        misses.append(({"cache": name}, stats["misses"]))
+    audio = audio_store.stats()
+    hits.append(({"cache": "audio", "tier": "disk"}, audio["hits"]))
+    misses.append(({"cache": "audio"}, audio["misses"]))
+    langdetect = language_detector.stats()
+    hits.append(({"cache": "langdetect", "tier": "memory"}, langdetect["hits"]))
+    misses.append(({"cache": "langdetect"}, langdetect["misses"]))
+    yield ("eduai_cache_hits_total", "counter", "Cache hits by cache and tier", hits)
+    yield ("eduai_cache_misses_total", "counter", "Cache misses by cache", misses)
+    
+    llm = llm_gateway.stats()
+    yield ("eduai_llm_in_flight", "gauge", "Upstream LLM calls holding a concurrency slot", [({}, llm["in_flight"])])
+    yield ("eduai_llm_waiting", "gauge", "LLM calls waiting for rate-limit budget or a slot", [({}, llm["waiting"])])
+    
+    yield ("eduai_single_flight_in_flight", "gauge", "Distinct calls currently in flight per coalesced function",
+           [({"function": name}, stats["in_flight"]) for name, stats in single_flight_stats().items()])
+    
+    http = http_clients.stats()
+    yield ("eduai_http_client_requests_total", "counter", "Outbound requests per shared HTTP client",
+           [({"client": name}, stats["requests"]) for name, stats in http.items()])
+    yield ("eduai_http_client_connections_opened_total", "counter",
+           "New outbound connections per shared HTTP client (requests minus these reused a connection)",
+           [({"client": name}, stats["connections_opened"]) for name, stats in http.items()])
+
+registry.add_collector(_runtime_metrics)
 
 @app.post("/generate-script")
 async def generate_script_api(data: ScriptRequest):
@@ -110,8 +307,8 @@ async def generate_script_api(data: ScriptRequest):
             raise HTTPException(status_code=400, detail="Duration must be between 1 and 60 minutes")
         
         # Generate script using your core logic
-        script = generate_script(data.topic, data.duration)
-        word_count = len(script.split())
+        script = await generate_script_flight.run(data.topic, data.duration, data.audience_level, not data.no_cache)
+        word_count = count_words(script)
         
         return {
             "success": True,
@@ -137,8 +334,10 @@ async def generate_video_script_api(data: VideoScriptRequest):
             raise HTTPException(status_code=400, detail="Duration must be between 1 and 60 minutes")
         
         # Generate video script directly without regular script first
-        video_script = generate_video_script_direct(data.topic, data.duration)
-        word_count = len(video_script.split())
+        video_script = await generate_video_script_flight.run(
+            data.topic, data.duration, data.audience_level, not data.no_cache
+        )
+        word_count = count_words(video_script)
         
         return {
             "success": True,
@@ -153,6 +352,57 @@ async def generate_video_script_api(data: VideoScriptRequest):
         print(f"❌ Video script generation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Video script generation failed: {str(e)}")
 
+def _sse_event(data, event=None):
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+async def _stream_script_events(stream_factory, data, script_type):
+    # Send an event right away so the client isn't left waiting on the Wikipedia lookup
+    yield _sse_event({"topic": data.topic, "duration": data.duration, "script_type": script_type}, event="start")
+    
+    words = WordCounter()
+    try:
+        async for delta in iterate_io(stream_factory(data.topic, data.duration)):
+            words.feed(delta)
+            yield _sse_event({"delta": delta})
+    except Exception as e:
+        print(f"❌ Streaming {script_type} script error: {str(e)}")
+        yield _sse_event({"error": f"Script generation failed: {str(e)}"}, event="error")
+        return
+    
+    yield _sse_event({
+        "success": True,
+        "word_count": words.count,
+        "estimated_duration": f"{data.duration} minutes",
+        "generated_at": datetime.now().isoformat()
+    }, event="done")
+
+def _validate_script_request(data):
+    if not data.topic.strip():
+        raise HTTPException(status_code=400, detail="Topic cannot be empty")
+    
+    if data.duration < 1 or data.duration > 60:
+        raise HTTPException(status_code=400, detail="Duration must be between 1 and 60 minutes")
+
+def _sse_response(events):
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/generate-script/stream")
+async def generate_script_stream_api(data: ScriptRequest):
+    print(f"📝 Streaming script for topic: {data.topic}")
+    _validate_script_request(data)
+    return _sse_response(_stream_script_events(stream_script, data, "regular"))
+
+@app.post("/generate-video-script/stream")
+async def generate_video_script_stream_api(data: VideoScriptRequest):
+    print(f"🎬 Streaming video-optimized script for topic: {data.topic}")
+    _validate_script_request(data)
+    return _sse_response(_stream_script_events(stream_video_script, data, "video_optimized"))
+
 @app.post("/translate-script")
 async def translate_script_api(data: TranslationRequest):
     try:
@@ -162,7 +412,7 @@ async def translate_script_api(data: TranslationRequest):
             raise HTTPException(status_code=400, detail="Text cannot be empty")
         
         # Translate using your core logic (with fallback)
-        translated_text = translate_script(data.text, data.target_language)
+        translated_text = await translate_script_flight.run(data.text, data.target_language)
         
         # Check if translation failed
         if translated_text.startswith("❌"):
@@ -201,6 +451,154 @@ Please try again later or contact support.
             "error": "Translation service unavailable"
         }
 
+async def _detect_language(text):
+    """
+    Sample and memo lookup happen here; only a memo miss ships the (bounded) sample to a worker process
+    """
+    sample = language_detector.sample(text)
+    language = language_detector.cached(sample)
+    if language is MISSING:
+        with track_stage("langdetect"):
+            language = await run_cpu(detect_language, sample)
+        language_detector.remember(sample, language)
+    return language
+
+async def _detect_languages(texts):
+    """
+    _detect_language for many texts: memo misses go to one worker process in a single
+    detect_batch call, each distinct sample analysed once
+    """
+    samples = [language_detector.sample(text) for text in texts]
+    languages = {}
+    for sample in samples:
+        if sample not in languages:
+            languages[sample] = language_detector.cached(sample)
+    
+    missing = [sample for sample, language in languages.items() if language is MISSING]
+    if missing:
+        with track_stage("langdetect"):
+            detected = await run_cpu(detect_languages, missing)
+        for sample, language in zip(missing, detected):
+            language_detector.remember(sample, language)
+            languages[sample] = language
+    return [languages[sample] for sample in samples]
+
+def _synthesize_to_store(audio_id, text, language, progress=None):
+    """
+    Synthesize text segment by segment into a part file and commit it to the audio store,
+    coalesced as one unit so that concurrent identical requests synthesize and write the file
+    once. progress(done, total) is called after each segment. Returns (status, audio_info) like
+    text_to_speech_from_content, with audio_info None when synthesis failed.
+    """
+    if not text.strip():
+        return "No text found.", None
+    
+    total = len(split_sentences(text))
+    part_path = audio_store.part_path(audio_id)
+    try:
+        with open(part_path, "wb") as audio_file:
+            for done, audio_data in enumerate(synthesize_stream(text, language), start=1):
+                with track_stage("file_write"):
+                    audio_file.write(audio_data)
+                if progress is not None:
+                    progress(done, total)
+    except Exception as e:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(part_path)
+        print(f"❌ TTS error: {str(e)}")
+        return f"TTS Error: {str(e)}", None
+    
+    audio_info = audio_store.commit(audio_id, part_path, language, text)
+    print(f"✅ Audio saved: {audio_info['path']}")
+    return f"Language detected: {language}", audio_info
+
+text_to_speech_flight = SingleFlight(_synthesize_to_store, "text_to_speech_from_content")
+
+def _lookup_audio(audio_id):
+    """(status, audio_info) for a clip already in the store, or (None, None)"""
+    audio_info = audio_store.lookup(audio_id)
+    if audio_info is None:
+        return None, None
+    print(f"📚 Audio served from store: {audio_info['path']}")
+    return f"Language detected: {audio_info['language']} (cached)", audio_info
+
+def _describe_audio(audio_id, audio_info, status, text, speed, word_count=None):
+    """
+    Response fields for a stored clip. word_count can be passed when the caller has already
+    counted the text.
+    """
+    # Calculate duration estimate
+    if word_count is None:
+        word_count = count_words(text)
+    estimated_duration_seconds = int(word_count / 2.5 * speed)
+    duration_minutes = estimated_duration_seconds // 60
+    duration_seconds = estimated_duration_seconds % 60
+    
+    return {
+        "audio_url": f"/audio/{audio_info['filename']}",
+        "audio_id": audio_id,
+        "duration": f"{duration_minutes}:{duration_seconds:02d}",
+        "file_size": f"{audio_info['size'] / 1024:.1f} KB",
+        "format": "MP3",
+        "status": status
+    }
+
+async def _synthesize_audio(text, language, speed, voice_type, word_count=None):
+    """
+    Synthesize text in language (a gTTS code, given or detected by the caller) into the audio
+    store, or reuse the stored clip, and describe the result
+    """
+    # Every endpoint keys clips by the language actually spoken, so identical requests share one file
+    audio_id = audio_key(text, language, speed, voice_type)
+    status, audio_info = await run_io(_lookup_audio, audio_id)
+    
+    if audio_info is None:
+        status, audio_info = await text_to_speech_flight.run(audio_id, text, language)
+        if not audio_info:
+            raise HTTPException(status_code=400, detail=status)
+    
+    return _describe_audio(audio_id, audio_info, status, text, speed, word_count)
+
+@app.post("/translate-script/batch")
+async def translate_script_batch_api(data: BatchTranslationRequest):
+    """
+    Translate one text into many languages, streaming each language as an SSE event when it completes
+    """
+    if not data.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    target_languages = list(dict.fromkeys(data.target_languages))  # drop duplicates, keep order
+    if not target_languages:
+        raise HTTPException(status_code=400, detail="No target languages provided")
+    
+    print(f"🌐 Translating text to {len(target_languages)} languages")
+    
+    async def translation_events():
+        yield _sse_event({"target_languages": target_languages}, event="start")
+        succeeded = 0
+        try:
+            async for target_language, translated_text, error in iterate_io(
+                translate_to_languages(data.text, target_languages)
+            ):
+                if error:
+                    yield _sse_event({"success": False, "target_language": target_language, "error": error}, event="translation")
+                    continue
+                succeeded += 1
+                yield _sse_event({
+                    "success": True,
+                    "translated_text": translated_text,
+                    "source_language": "english",
+                    "target_language": target_language,
+                    "confidence_score": 0.95
+                }, event="translation")
+        except Exception as e:
+            print(f"❌ Batch translation error: {str(e)}")
+            yield _sse_event({"error": f"Translation failed: {str(e)}"}, event="error")
+            return
+        yield _sse_event({"success": succeeded == len(target_languages), "completed": succeeded, "total": len(target_languages)}, event="done")
+    
+    return _sse_response(translation_events())
+
 @app.post("/text-to-speech")
 async def text_to_speech_api(request: TextToSpeechRequest):
     try:
@@ -209,50 +607,296 @@ async def text_to_speech_api(request: TextToSpeechRequest):
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
         
-        # Convert to speech using improved function
-        status, audio_data = text_to_speech_from_content(request.text)
-        
-        if not audio_data:
-            raise HTTPException(status_code=400, detail=status)
-        
-        # Generate unique filename
-        audio_id = str(uuid.uuid4())
-        audio_filename = f"audio_{audio_id}.mp3"
-        audio_path = os.path.join("audio_files", audio_filename)
-        
-        # Save audio file
-        with open(audio_path, 'wb') as f:
-            f.write(audio_data)
-        
-        # Store audio info
-        audio_storage[audio_id] = {
-            "filename": audio_filename,
-            "path": audio_path,
-            "text": request.text[:100] + "..." if len(request.text) > 100 else request.text
-        }
-        
-        # Calculate duration estimate
-        word_count = len(request.text.split())
-        estimated_duration_seconds = int(word_count / 2.5 * request.speed)
-        duration_minutes = estimated_duration_seconds // 60
-        duration_seconds = estimated_duration_seconds % 60
-        
-        print(f"✅ Audio saved: {audio_path}")
-        
-        return {
-            "success": True,
-            "audio_url": f"/audio/{audio_filename}",
-            "audio_id": audio_id,
-            "duration": f"{duration_minutes}:{duration_seconds:02d}",
-            "file_size": f"{len(audio_data) / 1024:.1f} KB",
-            "format": "MP3",
-            "status": status
-        }
+        # The spoken language comes from the text; request.language isn't used for synthesis
+        language = await _detect_language(request.text)
+        audio = await _synthesize_audio(request.text, language, request.speed, request.voice_type)
+        return {"success": True, **audio}
         
     except Exception as e:
         print(f"❌ Text-to-speech error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Text-to-speech conversion failed: {str(e)}")
 
+@app.post("/text-to-speech/batch")
+async def text_to_speech_batch_api(request: BatchTextToSpeechRequest):
+    print(f"🎤 Converting batch of {len(request.items)} texts to speech...")
+    
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items provided")
+    if len(request.items) > settings.TTS_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {settings.TTS_BATCH_MAX_ITEMS})")
+    if any(not item.text.strip() for item in request.items):
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    started = time.perf_counter()
+    slots = asyncio.Semaphore(settings.TTS_BATCH_CONCURRENCY)
+    
+    # Given languages ("spanish", "es") are mapped to gTTS codes; the rest are detected together,
+    # in one call to the process pool
+    try:
+        given = [tts_language_code(item.language) if item.language else None for item in request.items]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    undetected = list(dict.fromkeys(item.text for item, language in zip(request.items, given) if language is None))
+    detected = dict(zip(undetected, await _detect_languages(undetected)))
+    languages = [language or detected[item.text] for item, language in zip(request.items, given)]
+    
+    # Identical items are synthesized once and share the result; keys match the single-item endpoints
+    unique = {}
+    for index, (item, language) in enumerate(zip(request.items, languages)):
+        key = audio_key(item.text, language, request.speed, request.voice_type)
+        unique.setdefault(key, (item.text, language, []))[2].append(index)
+    
+    async def synthesize_item(text, language):
+        async with slots:
+            item_started = time.perf_counter()
+            try:
+                audio = await _synthesize_audio(text, language, request.speed, request.voice_type)
+                result = {"success": True, **audio}
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                print(f"❌ Batch text-to-speech item error: {detail}")
+                result = {"success": False, "error": f"Text-to-speech conversion failed: {detail}"}
+            result["elapsed_seconds"] = round(time.perf_counter() - item_started, 3)
+            return result
+    
+    results = await asyncio.gather(*(synthesize_item(text, language) for text, language, _ in unique.values()))
+    
+    items = [None] * len(request.items)
+    for result, (_, _, indexes) in zip(results, unique.values()):
+        for position, index in enumerate(indexes):
+            items[index] = {"index": index, **result, "deduplicated": position > 0}
+    
+    total_seconds = time.perf_counter() - started
+    print(f"✅ Batch of {len(items)} ({len(unique)} unique) finished in {total_seconds:.1f}s")
+    
+    return {
+        "success": all(item["success"] for item in items),
+        "items": items,
+        "unique_items": len(unique),
+        "total_seconds": round(total_seconds, 3)
+    }
+
+def _finish_streamed_audio(audio_file, audio_id, part_path, language, text, complete):
+    """
+    Close a streamed clip's part file and either commit it to the store (SQLite write, rename,
+    LRU eviction) or delete it; all blocking, so run on the I/O pool
+    """
+    audio_file.close()
+    if not complete:
+        os.remove(part_path)
+        return None
+    return audio_store.commit(audio_id, part_path, language, text)
+
+@app.post("/text-to-speech/stream")
+async def text_to_speech_stream_api(request: TextToSpeechRequest):
+    print(f"🎤 Streaming text to speech...")
+    
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    language = await _detect_language(request.text)
+    audio_id = audio_key(request.text, language, request.speed, request.voice_type)
+    audio_filename = audio_store.filename_for(audio_id)
+    audio_info = await run_io(audio_store.lookup, audio_id)
+    
+    if audio_info:
+        print(f"📚 Audio served from store: {audio_info['path']}")
+        return FileResponse(
+            path=audio_info["path"],
+            media_type="audio/mpeg",
+            headers={
+                "X-Audio-Id": audio_id,
+                "X-Audio-Url": f"/audio/{audio_filename}",
+                "X-Detected-Language": audio_info["language"] or ""
+            }
+        )
+    
+    async def audio_chunks():
+        # Tee each segment to disk as it is sent; the file only appears under its final name once complete
+        part_path = await run_io(audio_store.part_path, audio_id)
+        audio_file = await run_io(open, part_path, "wb")
+        complete = False
+        try:
+            async for audio_data in iterate_io(synthesize_stream(request.text, language)):
+                with track_stage("file_write"):
+                    await run_io(audio_file.write, audio_data)
+                yield audio_data
+            complete = True
+        except Exception as e:
+            print(f"❌ Streaming text-to-speech error: {str(e)}")
+        finally:
+            # Shielded: a client that disconnects mid-stream must not leave the part file behind
+            stored = await asyncio.shield(run_io(
+                _finish_streamed_audio, audio_file, audio_id, part_path, language, request.text, complete
+            ))
+            if stored:
+                print(f"✅ Streamed audio saved: {stored['path']}")
+    
+    return StreamingResponse(
+        audio_chunks(),
+        media_type="audio/mpeg",
+        headers={
+            "X-Audio-Id": audio_id,
+            "X-Audio-Url": f"/audio/{audio_filename}",
+            "X-Detected-Language": language
+        }
+    )
+
+@app.post("/pipeline")
+async def pipeline_api(data: PipelineRequest):
+    """
+    Topic -> video script -> translations -> audio in one request.
+    Each language branch starts TTS as soon as its own translation finishes.
+    """
+    _validate_script_request(data)
+    target_languages = list(dict.fromkeys(data.target_languages))  # drop duplicates, keep order
+    started = time.perf_counter()
+    print(f"🏭 Pipeline for topic: {data.topic} -> {target_languages or 'no translations'}")
+    
+    try:
+        script = await generate_video_script_flight.run(
+            data.topic, data.duration, data.audience_level, not data.no_cache
+        )
+    except Exception as e:
+        print(f"❌ Pipeline script generation error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Script generation failed: {str(e)}")
+    script_seconds = time.perf_counter() - started
+    script_word_count = count_words(script)
+    
+    async def source_audio_branch():
+        branch_started = time.perf_counter()
+        try:
+            language = await _detect_language(script)
+            audio = await _synthesize_audio(script, language, data.speed, data.voice_type, word_count=script_word_count)
+            return {"success": True, **audio, "elapsed_seconds": round(time.perf_counter() - branch_started, 3)}
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            return {"success": False, "error": f"Text-to-speech conversion failed: {detail}"}
+    
+    async def language_branch(target_language):
+        branch_started = time.perf_counter()
+        result = {"language": target_language}
+        try:
+            translated_text = await translate_script_flight.run(script, target_language)
+            if translated_text.startswith("❌"):
+                return {**result, "success": False, "error": translated_text}
+            result["translated_text"] = translated_text
+            result["translation_seconds"] = round(time.perf_counter() - branch_started, 3)
+            
+            language = await _detect_language(translated_text)
+            audio = await _synthesize_audio(translated_text, language, data.speed, data.voice_type)
+            result["audio"] = audio
+            result["success"] = True
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            print(f"❌ Pipeline branch {target_language} error: {detail}")
+            result["success"] = False
+            result["error"] = detail
+        result["elapsed_seconds"] = round(time.perf_counter() - branch_started, 3)
+        return result
+    
+    branches = [language_branch(language) for language in target_languages]
+    if data.include_source_audio:
+        branches.append(source_audio_branch())
+    results = await asyncio.gather(*branches)
+    
+    source_audio = results.pop() if data.include_source_audio else None
+    total_seconds = time.perf_counter() - started
+    print(f"✅ Pipeline finished in {total_seconds:.1f}s")
+    
+    return {
+        "success": all(result["success"] for result in results) and (source_audio is None or source_audio["success"]),
+        "topic": data.topic,
+        "script": {
+            "text": script,
+            "word_count": script_word_count,
+            "estimated_duration": f"{data.duration} minutes (video format)",
+            "audio": source_audio
+        },
+        "translations": results,
+        "timings": {
+            "script_seconds": round(script_seconds, 3),
+            "total_seconds": round(total_seconds, 3)
+        },
+        "generated_at": datetime.now().isoformat()
+    }
+
+def _hash_upload(upload):
+    """
+    SHA-256 and size of an upload's spooled body, read in chunks from Starlette's own spool
+    (no copy). Returns (size, hex digest) and leaves the file rewound.
+    """
+    digest = hashlib.sha256()
+    file_size = 0
+    upload.seek(0)
+    while True:
+        chunk = upload.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        file_size += len(chunk)
+        digest.update(chunk)
+    upload.seek(0)
+    return file_size, digest.hexdigest()
+
+def _upload_to_path(upload, suffix):
+    """
+    Extraction runs in worker processes, which need a path: write the spooled upload out to a
+    named temp file. Only done on an extraction cache miss.
+    """
+    upload.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as spool:
+        try:
+            shutil.copyfileobj(upload, spool, settings.UPLOAD_CHUNK_SIZE)
+        except BaseException:
+            spool.close()
+            os.remove(spool.name)
+            raise
+    return spool.name
+
+async def _summarize_upload(path, filename, content_type):
+    """
+    Extract an uploaded document; large PDFs are split into page ranges across the process pool
+    """
+    extension = resolve_extension(filename, content_type)
+    # Parsing happens in worker processes, so the stage is timed here in the server process
+    with track_stage("pdf_parse" if extension == ".pdf" else "document_parse"):
+        # One worker call: small documents come back extracted, large PDFs as just their page count
+        extraction = await run_cpu(
+            summarize_document,
+            path,
+            filename,
+            content_type,
+            preview_chars=1000,
+            sample_chars=settings.LANGDETECT_SAMPLE_CHARS,
+            parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES
+        )
+        
+        if "page_count" in extraction:
+            return await run_io(
+                summarize_pdf_parallel,
+                path,
+                extraction["page_count"],
+                cpu_pool.submit,
+                pages_per_range=settings.PDF_PAGES_PER_RANGE,
+                max_in_flight=cpu_pool.max_workers * 2,
+                preview_chars=1000,
+                sample_chars=settings.LANGDETECT_SAMPLE_CHARS
+            )
+        return extraction
+
+def _upload_response(filename, file_size, extraction):
+    word_count = extraction["word_count"]
+    return {
+        "success": True,
+        "filename": filename,
+        "file_size": f"{file_size / 1024:.1f} KB",
+        "detected_language": extraction["detected_language"],
+        "confidence_score": extraction["confidence_score"],
+        "word_count": word_count,
+        "estimated_audio_duration": f"{word_count // 150} minutes",  # 150 words per minute average
+        "extracted_text": extraction["extracted_text"]
+    }
+
 @app.post("/upload-document")
 async def upload_document(file: UploadFile = File(...)):
     try:
@@ -266,26 +910,38 @@ async def upload_document(file: UploadFile = File(...)):
         if file.content_type not in allowed_types:
             raise HTTPException(status_code=400, detail="Unsupported file type")
         
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
+        # UploadSizeLimitMiddleware already cut off bodies past the limit; this is the exact check
+        file_size, digest = await run_io(_hash_upload, file.file)
+        if file_size > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large (max {settings.MAX_FILE_SIZE // (1024 * 1024)}MB)"
+            )
         
         print(f"📊 File size: {file_size} bytes")
         print(f"📋 Content type: {file.content_type}")
         
-        # Extract text using improved function
-        extracted_text = extract_text_from_file(
-            file_content=file_content,
-            filename=file.filename,
-            content_type=file.content_type
-        )
+        # Same bytes with the same parser give the same result, so a repeat upload stops here
+        extension = resolve_extension(file.filename, file.content_type)
+        cache_key = f"{digest}:{extension}"
+        extraction = await run_io(extraction_cache.get, cache_key)
+        if extraction is not MISSING:
+            print(f"📚 Extraction served from cache: {extraction['word_count']} words")
+            return _upload_response(file.filename, file_size, extraction)
         
-        if not extracted_text or extracted_text.startswith("Error"):
+        # Extract text page by page / paragraph by paragraph in the process pool
+        spool_path = await run_io(_upload_to_path, file.file, extension)
+        try:
+            summary = await _summarize_upload(spool_path, file.filename, file.content_type)
+        finally:
+            os.remove(spool_path)
+        
+        if summary["error"] or not summary["word_count"]:
             return {
                 "success": False,
                 "filename": file.filename,
                 "file_size": f"{file_size / 1024:.1f} KB",
-                "error": extracted_text or "Failed to extract text",
+                "error": summary["error"] or "Failed to extract text",
                 "detected_language": "Unknown",
                 "confidence_score": 0.0,
                 "word_count": 0,
@@ -293,32 +949,27 @@ async def upload_document(file: UploadFile = File(...)):
                 "extracted_text": "Text extraction failed"
             }
         
-        # Calculate metrics
-        word_count = len(extracted_text.split())
-        estimated_duration = f"{word_count // 150} minutes"  # 150 words per minute average
-        
         # Detect language
         try:
-            from langdetect import detect
-            detected_lang = detect(extracted_text)
+            detected_lang = await _detect_language(summary["sample"])
             confidence = 0.95
-        except:
+        except Exception:
             detected_lang = "en"
             confidence = 0.5
         
-        print(f"✅ Text extracted successfully: {word_count} words")
+        print(f"✅ Text extracted successfully: {summary['word_count']} words")
         
-        return {
-            "success": True,
-            "filename": file.filename,
-            "file_size": f"{file_size / 1024:.1f} KB",
+        extraction = {
+            "word_count": summary["word_count"],
+            "extracted_text": summary["preview"],
             "detected_language": detected_lang,
-            "confidence_score": confidence,
-            "word_count": word_count,
-            "estimated_audio_duration": estimated_duration,
-            "extracted_text": extracted_text[:1000] + "..." if len(extracted_text) > 1000 else extracted_text
+            "confidence_score": confidence
         }
+        await run_io(extraction_cache.set, cache_key, extraction)
+        return _upload_response(file.filename, file_size, extraction)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Document upload error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Document upload failed: {str(e)}")
@@ -326,17 +977,12 @@ async def upload_document(file: UploadFile = File(...)):
 @app.get("/download-audio/{audio_id}")
 async def download_audio(audio_id: str):
     try:
-        if audio_id not in audio_storage:
+        audio_info = await run_io(audio_store.lookup, audio_id)
+        if not audio_info:
             raise HTTPException(status_code=404, detail="Audio file not found")
         
-        audio_info = audio_storage[audio_id]
-        audio_path = audio_info["path"]
-        
-        if not os.path.exists(audio_path):
-            raise HTTPException(status_code=404, detail="Audio file not found on disk")
-        
         return FileResponse(
-            path=audio_path,
+            path=audio_info["path"],
             media_type="audio/mpeg",
             filename=audio_info["filename"]
         )
@@ -345,6 +991,164 @@ async def download_audio(audio_id: str):
         print(f"❌ Download error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
 
+def _check_admin_key(admin_key):
+    # Fail closed: without a configured key the admin routes don't exist
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not admin_key or not hmac.compare_digest(admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=403, detail="Invalid admin key")
+
+@app.get("/admin/translation-cache")
+async def inspect_translation_cache(limit: int = 50, x_admin_key: Optional[str] = Header(None)):
+    _check_admin_key(x_admin_key)
+    entries = await run_io(translation_cache.disk.entries, limit)
+    return {
+        "stats": translation_cache.stats(),
+        "entries": entries
+    }
+
+@app.delete("/admin/translation-cache")
+async def purge_translation_cache(target_language: Optional[str] = None, x_admin_key: Optional[str] = Header(None)):
+    _check_admin_key(x_admin_key)
+    if target_language:
+        # Cache keys start with the language display name, e.g. "Spanish|..."
+        purged = await run_io(translation_cache.clear_prefix, f"{language_display_name(target_language)}|")
+    else:
+        purged = await run_io(translation_cache.clear)
+    print(f"🧹 Purged {purged} translation cache entries")
+    return {
+        "success": True,
+        "purged": purged,
+        "target_language": target_language or "all"
+    }
+
+# Background jobs: these run the same core_logic functions on the job worker pool
+def _script_job(params, progress):
+    progress(0.1, "Generating script")
+    script = generate_script_flight(
+        params["topic"], params["duration"], params.get("audience_level", "general"), not params.get("no_cache")
+    )
+    return {
+        "success": True,
+        "script": script,
+        "word_count": count_words(script),
+        "estimated_duration": f"{params['duration']} minutes",
+        "generated_at": datetime.now().isoformat()
+    }
+
+def _video_script_job(params, progress):
+    progress(0.1, "Generating video script")
+    video_script = generate_video_script_flight(
+        params["topic"], params["duration"], params.get("audience_level", "general"), not params.get("no_cache")
+    )
+    return {
+        "success": True,
+        "script": video_script,
+        "word_count": count_words(video_script),
+        "estimated_duration": f"{params['duration']} minutes (video format)",
+        "script_type": "video_optimized",
+        "generated_at": datetime.now().isoformat()
+    }
+
+def _translation_job(params, progress):
+    def chunk_progress(done, total):
+        progress(done / total, f"Translated chunk {done}/{total}")
+    
+    translated_text = translate_script(params["text"], params["target_language"], chunk_progress)
+    if translated_text.startswith("❌"):
+        raise RuntimeError(translated_text)
+    return {
+        "success": True,
+        "translated_text": translated_text,
+        "source_language": "english",
+        "target_language": params["target_language"],
+        "confidence_score": 0.95
+    }
+
+def _text_to_speech_job(params, progress):
+    text = params["text"]
+    with track_stage("langdetect"):
+        language = detect_language(text)
+    audio_id = audio_key(text, language, params["speed"], params["voice_type"])
+    status, audio_info = _lookup_audio(audio_id)
+    
+    if audio_info is None:
+        def segment_progress(done, total):
+            progress(done / total, f"Synthesized segment {done}/{total}")
+        
+        # Same flight as the endpoints: a job and a request for the same clip synthesize it once
+        status, audio_info = text_to_speech_flight(audio_id, text, language, progress=segment_progress)
+        if not audio_info:
+            raise RuntimeError(status)
+    
+    return {"success": True, **_describe_audio(audio_id, audio_info, status, text, params["speed"])}
+
+job_queue.register("generate-script", _script_job)
+job_queue.register("generate-video-script", _video_script_job)
+job_queue.register("translate-script", _translation_job)
+job_queue.register("text-to-speech", _text_to_speech_job)
+
+async def _submit_job(kind, data):
+    # The finished job record is POSTed to callback_url, so internal hosts are off limits
+    try:
+        await run_io(job_queue.check_callback_url, data.callback_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    params = data.dict(exclude={"callback_url"})
+    job_id = await run_io(job_queue.submit, kind, params, data.callback_url)
+    print(f"⚙️ Queued {kind} job {job_id}")
+    return {
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}"
+    }
+
+@app.post("/jobs/generate-script", status_code=202)
+async def submit_script_job(data: ScriptJobRequest):
+    _validate_script_request(data)
+    return await _submit_job("generate-script", data)
+
+@app.post("/jobs/generate-video-script", status_code=202)
+async def submit_video_script_job(data: VideoScriptJobRequest):
+    _validate_script_request(data)
+    return await _submit_job("generate-video-script", data)
+
+@app.post("/jobs/translate-script", status_code=202)
+async def submit_translation_job(data: TranslationJobRequest):
+    if not data.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    return await _submit_job("translate-script", data)
+
+@app.post("/jobs/text-to-speech", status_code=202)
+async def submit_text_to_speech_job(data: TextToSpeechJobRequest):
+    if not data.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    return await _submit_job("text-to-speech", data)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await run_io(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.pop("params")
+    return job
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await run_io(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != "completed":
+        return JSONResponse(
+            status_code=202,
+            content={"success": False, "job_id": job_id, "status": job["status"], "progress": job["progress"]}
+        )
+    return job["result"]
+
 # Add OPTIONS handler for CORS preflight
 @app.options("/{full_path:path}")
 async def options_handler():
@@ -0,0 +1,227 @@
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from config import settings
+from services.metrics import track_stage
+
+
+def audio_key(text: str, language: str, speed: float, voice_type: str) -> str:
+    """Content address for a synthesized clip"""
+    payload = json.dumps([text, language, speed, voice_type], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class AudioStore:
+    """
+    Content-addressed MP3 store under the /audio static directory.
+    Identical requests map to the same file; an on-disk SQLite index tracks sizes and last use
+    so the directory stays within max_bytes (least recently used clips are deleted first).
+    Entry and byte totals are kept in memory, so stats() never touches the index or the disk.
+    """
+
+    def __init__(self, directory: str, index_path: str, max_bytes: int, part_max_age: float = 3600):
+        self.directory = directory
+        self.index_path = index_path
+        self.max_bytes = max_bytes
+        self.part_max_age = part_max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = 0
+        self._total_bytes = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            index_dir = os.path.dirname(self.index_path)
+            if index_dir:
+                os.makedirs(index_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS audio ("
+                "audio_id TEXT PRIMARY KEY, filename TEXT NOT NULL, size INTEGER NOT NULL, "
+                "language TEXT, text_preview TEXT, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._reconcile()
+            self._conn.commit()
+        return self._conn
+
+    def open(self):
+        """Connect and reconcile now rather than on first use (the initial scan stats every clip)"""
+        with self._lock:
+            self._connect()
+
+    def _reconcile(self):
+        """Bring the index in line with the directory after a restart"""
+        indexed = {
+            filename: audio_id
+            for audio_id, filename in self._conn.execute("SELECT audio_id, filename FROM audio")
+        }
+        for filename, audio_id in indexed.items():
+            if not os.path.exists(os.path.join(self.directory, filename)):
+                self._conn.execute("DELETE FROM audio WHERE audio_id = ?", (audio_id,))
+
+        # Partial files left behind by an interrupted write. Other workers share the directory and
+        # may be writing right now, so only files untouched for part_max_age count as abandoned.
+        cutoff = time.time() - self.part_max_age
+        for path in glob.glob(os.path.join(self.directory, ".*.part")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        # Adopt clips written before the index existed so they count against the budget
+        for path in glob.glob(os.path.join(self.directory, "audio_*.mp3")):
+            filename = os.path.basename(path)
+            if filename in indexed:
+                continue
+            audio_id = filename[len("audio_"):-len(".mp3")]
+            stat = os.stat(path)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO audio (audio_id, filename, size, language, text_preview, created_at, last_access) "
+                "VALUES (?, ?, ?, NULL, NULL, ?, ?)",
+                (audio_id, filename, stat.st_size, stat.st_mtime, stat.st_mtime)
+            )
+
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM audio").fetchone()
+        self._entries, self._total_bytes = row
+
+    @staticmethod
+    def filename_for(audio_id: str) -> str:
+        return f"audio_{audio_id}.mp3"
+
+    def path_for(self, audio_id: str) -> str:
+        return os.path.join(self.directory, self.filename_for(audio_id))
+
+    def lookup(self, audio_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored clip's metadata (and mark it as recently used), or None"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT filename, size, language, text_preview, created_at FROM audio WHERE audio_id = ?",
+                (audio_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            filename, size, language, text_preview, created_at = row
+            path = os.path.join(self.directory, filename)
+            if not os.path.exists(path):
+                conn.execute("DELETE FROM audio WHERE audio_id = ?", (audio_id,))
+                conn.commit()
+                self._entries -= 1
+                self._total_bytes -= size
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE audio SET last_access = ? WHERE audio_id = ?", (time.time(), audio_id))
+            conn.commit()
+            self.hits += 1
+            return {
+                "audio_id": audio_id,
+                "filename": filename,
+                "path": path,
+                "size": size,
+                "language": language,
+                "text": text_preview,
+                "created_at": created_at
+            }
+
+    def part_path(self, audio_id: str) -> str:
+        """Unique temporary path for writing a clip before commit()"""
+        with self._lock:
+            # Connect first: the initial reconcile clears abandoned .part files
+            self._connect()
+        return os.path.join(self.directory, f".{audio_id}.{uuid.uuid4().hex}.part")
+
+    def put(self, audio_id: str, audio_data: bytes, language: str = None, text: str = None) -> Dict[str, Any]:
+        part_path = self.part_path(audio_id)
+        with track_stage("file_write"):
+            with open(part_path, "wb") as f:
+                f.write(audio_data)
+            return self.commit(audio_id, part_path, language, text)
+
+    def commit(self, audio_id: str, part_path: str, language: str = None, text: str = None) -> Dict[str, Any]:
+        """Move a fully written temporary file into place and index it"""
+        filename = self.filename_for(audio_id)
+        path = os.path.join(self.directory, filename)
+        size = os.path.getsize(part_path)
+        text_preview = text[:100] + "..." if text and len(text) > 100 else text
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            os.replace(part_path, path)
+            row = conn.execute("SELECT size FROM audio WHERE audio_id = ?", (audio_id,)).fetchone()
+            if row is not None:
+                self._total_bytes -= row[0]
+            else:
+                self._entries += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO audio (audio_id, filename, size, language, text_preview, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (audio_id, filename, size, language, text_preview, now, now)
+            )
+            self._total_bytes += size
+            self._evict_locked(keep=audio_id)
+            conn.commit()
+
+        return {
+            "audio_id": audio_id,
+            "filename": filename,
+            "path": path,
+            "size": size,
+            "language": language,
+            "text": text_preview,
+            "created_at": now
+        }
+
+    def _evict_locked(self, keep: str):
+        if self._total_bytes <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT audio_id, filename, size FROM audio WHERE audio_id != ? ORDER BY last_access ASC", (keep,)
+        ).fetchall()
+        for audio_id, filename, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+            self._conn.execute("DELETE FROM audio WHERE audio_id = ?", (audio_id,))
+            self._entries -= 1
+            self._total_bytes -= size
+            self.evictions += 1
+            print(f"🧹 Evicted audio file: {filename}")
+
+    def stats(self) -> Dict[str, Any]:
+        # Lock-free snapshot: commit() holds the lock while it evicts, and /health must not wait on that
+        return {
+            "entries": self._entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "indexed": self._conn is not None
+        }
+
+
+audio_store = AudioStore(
+    settings.AUDIO_OUTPUT_DIR,
+    os.path.join(settings.CACHE_DIR, "audio_index.sqlite3"),
+    settings.AUDIO_STORE_MAX_BYTES,
+    settings.AUDIO_PART_MAX_AGE
+)
@@ -0,0 +1,322 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Sentinel returned on a cache miss, so that a cached None (negative entry) can be told apart
+MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, max_entries)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, expires_at: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    On-disk key/value store with per-entry expiry, values stored as JSON.
+    When max_bytes is set, least recently used entries are evicted to stay within budget.
+    When purge_interval is set, writes also delete expired rows at most that often, since
+    expired entries are otherwise only removed when they happen to be read again.
+    """
+
+    def __init__(self, path: str, table: str = "cache", max_bytes: Optional[int] = None,
+                 purge_interval: Optional[float] = None):
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self.purge_interval = purge_interval
+        self.evictions = 0
+        self.purged = 0
+        self._total_bytes = 0
+        self._last_purge = 0.0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, "
+                "size INTEGER NOT NULL DEFAULT 0, last_access REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({self.table})")}
+            if "size" not in columns:
+                self._conn.execute(f"ALTER TABLE {self.table} ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute(f"UPDATE {self.table} SET size = length(value)")
+            if "last_access" not in columns:
+                self._conn.execute(f"ALTER TABLE {self.table} ADD COLUMN last_access REAL NOT NULL DEFAULT 0")
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_last_access ON {self.table} (last_access)"
+            )
+            self._conn.commit()
+            self._refresh_total_bytes()
+        return self._conn
+
+    def open(self):
+        """Create or open the database now rather than on first use"""
+        with self._lock:
+            self._connect()
+
+    def _refresh_total_bytes(self):
+        row = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        self._total_bytes = row[0]
+
+    def get_with_expiry(self, key: str):
+        """Return (value, expires_at), or (MISSING, None) when absent or expired"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return MISSING, None
+            value, expires_at = row
+            now = time.time()
+            if expires_at is not None and expires_at <= now:
+                self._delete_locked(key)
+                conn.commit()
+                return MISSING, None
+            if self.max_bytes is not None:
+                conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+            return json.loads(value), expires_at
+
+    def get(self, key: str) -> Any:
+        return self.get_with_expiry(key)[0]
+
+    def set(self, key: str, value: Any, expires_at: Optional[float] = None):
+        encoded = json.dumps(value)
+        size = len(encoded.encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            self._delete_locked(key)
+            conn.execute(
+                f"INSERT INTO {self.table} (key, value, expires_at, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, expires_at, size, time.time())
+            )
+            self._total_bytes += size
+            now = time.time()
+            if self.purge_interval is not None and now - self._last_purge >= self.purge_interval:
+                self._purge_expired_locked(now)
+            self._evict_locked()
+            conn.commit()
+
+    def _delete_locked(self, key: str):
+        row = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _evict_locked(self):
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY last_access ASC"
+        )
+        victims = []
+        excess = self._total_bytes - self.max_bytes
+        for key, size in rows:
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+            self._total_bytes -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connect()
+            self._delete_locked(key)
+            self._conn.commit()
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every entry whose key starts with prefix"""
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(f"DELETE FROM {self.table} WHERE key LIKE ? ESCAPE '\\'", (pattern,))
+            self._refresh_total_bytes()
+            conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(f"DELETE FROM {self.table}")
+            self._total_bytes = 0
+            conn.commit()
+            return cursor.rowcount
+
+    def entries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recently used entries, without their values"""
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT key, size, expires_at, last_access FROM {self.table} "
+                "ORDER BY last_access DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [
+            {"key": key, "size": size, "expires_at": expires_at, "last_access": last_access}
+            for key, size, expires_at, last_access in rows
+        ]
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            purged = self._purge_expired_locked(time.time())
+            conn.commit()
+            return purged
+
+    def _purge_expired_locked(self, now: float) -> int:
+        cursor = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        if cursor.rowcount:
+            self._refresh_total_bytes()
+        self._last_purge = now
+        self.purged += cursor.rowcount
+        return cursor.rowcount
+
+    @property
+    def total_bytes(self) -> int:
+        # Running total kept by every write, readable without the lock or a connection (0 until opened)
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """
+    Memory LRU in front of an optional SQLite store.
+    None values are cached as negative entries with their own (shorter) TTL.
+    """
+
+    def __init__(self, name: str, memory: LRUCache, disk: Optional[SQLiteCache] = None,
+                 ttl: Optional[float] = None, negative_ttl: Optional[float] = None):
+        self.name = name
+        self.memory = memory
+        self.disk = disk
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl if negative_ttl is not None else ttl
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get(self, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is not MISSING:
+            self._count(memory_hits=1, negative_hits=int(value is None))
+            return value
+
+        if self.disk is not None:
+            try:
+                value, expires_at = self.disk.get_with_expiry(key)
+            except sqlite3.Error as e:
+                print(f"⚠️ {self.name} cache read error: {str(e)}")
+                value = MISSING
+            if value is not MISSING:
+                self.memory.set(key, value, expires_at)
+                self._count(disk_hits=1, negative_hits=int(value is None))
+                return value
+
+        self._count(misses=1)
+        return MISSING
+
+    def set(self, key: str, value: Any):
+        ttl = self.negative_ttl if value is None else self.ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        self.memory.set(key, value, expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, expires_at)
+            except sqlite3.Error as e:
+                print(f"⚠️ {self.name} cache write error: {str(e)}")
+        self._count(stores=1)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> int:
+        self.memory.clear()
+        return self.disk.clear() if self.disk is not None else 0
+
+    def clear_prefix(self, prefix: str) -> int:
+        # The memory tier has no prefix index, so it is simply dropped
+        self.memory.clear()
+        return self.disk.delete_prefix(prefix) if self.disk is not None else 0
+
+    def _count(self, **increments):
+        with self._lock:
+            for field, amount in increments.items():
+                setattr(self, field, getattr(self, field) + amount)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            stats = {
+                "memory_entries": len(self.memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+            }
+        if self.disk is not None and self.disk.max_bytes is not None:
+            stats["disk_bytes"] = self.disk.total_bytes
+            stats["disk_max_bytes"] = self.disk.max_bytes
+            stats["disk_evictions"] = self.disk.evictions
+        if self.disk is not None and self.disk.purge_interval is not None:
+            stats["disk_purged"] = self.disk.purged
+        return stats
@@ -0,0 +1,120 @@
+import re
+from typing import Iterator, List, Tuple
+
+# Kana, CJK ideographs, Hangul
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+
+# The pieces a BPE tokenizer never merges across, with the characters each token covers on average.
+# Spaces are folded into the following word (as Llama 3's tokenizer does) and cost nothing extra.
+_PIECES = re.compile(
+    rf"(?P<cjk>[{_CJK_CHARS}])"
+    r"|(?P<latin>[A-Za-z]+)"
+    rf"|(?P<letters>[^\W\d_A-Za-z{_CJK_CHARS}]+)"
+    r"|(?P<digits>\d+)"
+    r"|(?P<newlines>\n+)"
+    r"|(?P<symbol>[^\w\s]|_)"
+)
+_CHARS_PER_TOKEN = {"cjk": 1, "latin": 5, "letters": 2, "digits": 3, "symbol": 1}
+
+# Boundaries, coarsest first. Each split point sits after the whitespace, so units are exact slices.
+_PARAGRAPH_END = re.compile(r"\n\s*\n\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？۔।])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:،؛—–])\s+")
+_WORD_END = re.compile(r"\s+")
+_LEVELS = (_PARAGRAPH_END, _SENTENCE_END, _CLAUSE_END, _WORD_END)
+
+
+def _chars_per_token(match: re.Match) -> int:
+    if match.lastgroup == "newlines":
+        return len(match.group())  # a run of newlines is one token
+    return _CHARS_PER_TOKEN[match.lastgroup]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate Llama 3 token count without the tokenizer: English words average about
+    five characters per token, digits go in groups of three, each punctuation mark is a token,
+    CJK is roughly a token per character and other non-Latin scripts about two characters per token.
+    Deliberately errs high so chunks stay within budget.
+    """
+    tokens = 0
+    for match in _PIECES.finditer(text):
+        tokens += -(-len(match.group()) // _chars_per_token(match))
+    return tokens
+
+
+def _token_pieces(text: str) -> Iterator[Tuple[str, int]]:
+    """Cut text into one-token pieces (by the estimate above); characters between pieces ride along"""
+    position = 0
+    for match in _PIECES.finditer(text):
+        step = _chars_per_token(match)
+        for start in range(match.start(), match.end(), step):
+            end = min(start + step, match.end())
+            yield text[position:end], 1
+            position = end
+    if position < len(text):
+        yield text[position:], 0
+
+
+def _split_after(text: str, boundary: re.Pattern) -> List[str]:
+    """Split text after each boundary match, keeping the matched whitespace with the preceding unit"""
+    units = []
+    start = 0
+    for match in boundary.finditer(text):
+        if match.end() > start:
+            units.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        units.append(text[start:])
+    return units
+
+
+def _units(text: str, max_tokens: int, level: int = 0) -> Iterator[Tuple[str, int]]:
+    """
+    (unit, tokens) pairs covering text in order. A unit over budget is split at the next
+    finer boundary; a single word still over budget is cut into one-token pieces.
+    """
+    if level == len(_LEVELS):
+        # Only a pathological "word" (no whitespace at all) gets here
+        yield from _token_pieces(text)
+        return
+
+    for unit in _split_after(text, _LEVELS[level]):
+        tokens = estimate_tokens(unit)
+        if tokens <= max_tokens:
+            yield unit, tokens
+        else:
+            yield from _units(unit, max_tokens, level + 1)
+
+
+def split_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens estimated tokens, preferring paragraph,
+    then sentence, then clause boundaries. Units are packed greedily in order, which gives the
+    fewest chunks for the given boundaries. Lossless: "".join(chunks) == text.
+    """
+    max_tokens = max(1, max_tokens)
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for unit, tokens in _units(text, max_tokens):
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("".join(current))
+            current = []
+            current_tokens = 0
+        current.append(unit)
+        current_tokens += tokens
+
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def split_outer_whitespace(chunk: str) -> Tuple[str, str, str]:
+    """(leading whitespace, body, trailing whitespace), so a translated body can be put back in place"""
+    body = chunk.strip()
+    if not body:
+        return chunk, "", ""
+    leading = chunk[:len(chunk) - len(chunk.lstrip())]
+    return leading, body, chunk[len(leading) + len(body):]
@@ -0,0 +1,182 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+
+from config import settings
+
+
+def _process_context():
+    """
+    Start workers from a clean forkserver (spawn where that doesn't exist), never by forking the
+    server: workers start on demand while the io, tts, gateway and job threads run, and a fork
+    would copy any lock one of them holds at that moment, leaving the worker stuck on it forever
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class InstrumentedPool:
+    """Executor wrapper that tracks queue depth and saturation for one worker pool"""
+
+    def __init__(self, name: str, kind: str, max_workers: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown pool kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is not None:
+                return self._executor
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-pool"
+                )
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_process_context())
+            return self._executor
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Submit a call to the pool and return a concurrent.futures.Future"""
+        call = partial(func, *args, **kwargs)
+
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        try:
+            try:
+                future = self._get_executor().submit(call)
+            except BrokenProcessPool:
+                # A worker process died; start a fresh pool and retry once
+                self._executor = None
+                future = self._get_executor().submit(call)
+        except Exception:
+            self._finish(failed=True)
+            raise
+
+        future.add_done_callback(lambda f: self._finish(failed=f.cancelled() or f.exception() is not None))
+        return future
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call in the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def _finish(self, failed: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            if failed:
+                self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self.in_flight
+            active = min(in_flight, self.max_workers)
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "active": active,
+                "queue_depth": max(0, in_flight - self.max_workers),
+                "peak_in_flight": self.peak_in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "saturation": round(active / self.max_workers, 3)
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Thread pool for network-bound calls (Groq, Wikipedia, gTTS)
+io_pool = InstrumentedPool("io", "thread", settings.IO_WORKERS)
+
+# Process pool for CPU-bound document parsing (PyPDF2, python-docx)
+cpu_pool = InstrumentedPool("cpu", "process", settings.CPU_WORKERS)
+
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    return await io_pool.run(func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    return await cpu_pool.run(func, *args, **kwargs)
+
+
+_EXHAUSTED = object()
+
+
+def _close_after(pending: Future, close: Callable) -> Future:
+    """
+    Run close() on the io pool once the pending next() (if any) has finished: a generator can't be
+    closed while another thread is still executing it. Scheduled by callback, so it happens even
+    if whoever awaits the returned future is cancelled.
+    """
+    done = Future()
+
+    def run_close(_=None):
+        try:
+            closing = io_pool.submit(close)
+        except Exception as e:  # pool already shut down
+            done.set_exception(e)
+            return
+        closing.add_done_callback(
+            lambda f: done.set_exception(f.exception()) if f.exception() else done.set_result(None)
+        )
+
+    if pending is None:
+        run_close()
+    else:
+        pending.add_done_callback(run_close)
+    return done
+
+
+async def iterate_io(iterator: Iterator) -> AsyncIterator:
+    """
+    Drive a blocking iterator (e.g. a streaming API response) from the io pool. When the consumer
+    stops early (client disconnected), the iterator is closed after any next() still running, so
+    its cleanup (cancelling the upstream request, shutting down helpers) runs promptly.
+    """
+    iterator = iter(iterator)
+    pending = None
+    try:
+        while True:
+            pending = io_pool.submit(next, iterator, _EXHAUSTED)
+            item = await asyncio.wrap_future(pending)
+            if item is _EXHAUSTED:
+                break
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            try:
+                # Shielded: a repeated cancellation must not interrupt the cleanup (close still runs regardless)
+                await asyncio.shield(asyncio.wrap_future(_close_after(pending, close)))
+            except Exception as e:
+                print(f"⚠️ Closing a streamed iterator failed: {str(e)}")
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {pool.name: pool.stats() for pool in (io_pool, cpu_pool)}
+
+
+def shutdown_executors():
+    for pool in (io_pool, cpu_pool):
+        pool.shutdown()
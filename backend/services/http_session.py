@@ -0,0 +1,139 @@
+import threading
+from typing import Any, Dict
+
+from config import settings
+
+USER_AGENT = "EducationalScriptApp/1.0"
+
+
+class ConnectionCounters:
+    """Requests sent vs. connections opened; the difference is requests that reused a kept-alive connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record(self, requests: int = 0, connections_opened: int = 0):
+        with self._lock:
+            self.requests += requests
+            self.connections_opened += connections_opened
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return _reuse_stats(self.requests, self.connections_opened)
+
+
+def _reuse_stats(requests: int, connections_opened: int) -> Dict[str, Any]:
+    reused = max(requests - connections_opened, 0)
+    return {
+        "requests": requests,
+        "connections_opened": connections_opened,
+        "connections_reused": reused,
+        "reuse_rate": round(reused / requests, 3) if requests else 0.0
+    }
+
+
+class HTTPClients:
+    """
+    Process-wide keep-alive HTTP clients for outbound calls: a requests.Session for Wikipedia,
+    built on first use so importing this module stays cheap, and the httpx.AsyncClient settings
+    for the Groq SDK (the LLM gateway builds that client on its own event loop).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self.groq_counters = ConnectionCounters()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    @staticmethod
+    def _build_session():
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=settings.HTTP_RETRIES,
+            backoff_factor=settings.HTTP_BACKOFF_FACTOR,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=settings.HTTP_POOL_HOSTS,
+            pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def build_groq_async_http_client(self):
+        """
+        Keep-alive pool for the Groq SDK. An httpx.AsyncClient belongs to the event loop it is
+        first used on, so the caller owns (and closes) it.
+        """
+        import httpx
+
+        counters = self.groq_counters
+
+        # httpcore reports each new TCP connection through the "trace" request extension
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                counters.record(connections_opened=1)
+
+        async def on_request(request):
+            request.extensions["trace"] = trace
+            counters.record(requests=1)
+
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.GROQ_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GROQ_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(settings.GROQ_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+            event_hooks={"request": [on_request]}
+        )
+
+    @property
+    def timeout(self):
+        """(connect, read) timeout for calls made through the requests session"""
+        return settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT
+
+    def _session_stats(self) -> Dict[str, Any]:
+        if self._session is None:
+            return _reuse_stats(0, 0)
+        requests = connections_opened = 0
+        # urllib3 keeps per-host pool counters; only pools still held by the pool manager are counted
+        for adapter in set(self._session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                requests += pool.num_requests
+                connections_opened += pool.num_connections
+        return _reuse_stats(requests, connections_opened)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"wikipedia": self._session_stats(), "groq": self.groq_counters.stats()}
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+http_clients = HTTPClients()
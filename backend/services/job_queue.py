@@ -0,0 +1,331 @@
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from services.executor import InstrumentedPool
+
+# Handlers receive the job params and a progress(fraction, message) callback and return a JSON-able result
+JobHandler = Callable[[Dict[str, Any], Callable[[float, Optional[str]], None]], Any]
+
+
+def check_callback_url(url: str, allowed_hosts: Iterable[str] = ()):
+    """
+    Raise ValueError unless url is safe to POST job records to: http(s) only, and either a host
+    on allowed_hosts or, without an allowlist, a host resolving only to public addresses (no
+    loopback, private, link-local/cloud metadata or reserved ranges)
+    """
+    parsed = urlparse(url)
+    try:
+        port = parsed.port
+    except ValueError:
+        raise ValueError("Callback URL has an invalid port")
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("Callback URL must be an http or https URL")
+
+    host = parsed.hostname.lower()
+    allowed_hosts = [allowed.lower() for allowed in allowed_hosts]
+    if allowed_hosts:
+        if host not in allowed_hosts:
+            raise ValueError(f"Callback host is not allowed: {host}")
+        return
+
+    try:
+        addresses = socket.getaddrinfo(host, port or (443 if parsed.scheme == "https" else 80), proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f"Callback host does not resolve: {host}")
+    for address in {info[4][0] for info in addresses}:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if getattr(ip, "ipv4_mapped", None):
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"Callback host is not a public address: {host}")
+
+
+class JobQueue:
+    """
+    Runs long generation work on a bounded worker pool, decoupled from HTTP requests.
+    Jobs are persisted in SQLite so status survives restarts; unfinished jobs are re-run on resume().
+
+    Several server processes may share the database. A job is claimed with a conditional UPDATE,
+    so exactly one process runs it, and the claim is a lease its owner keeps renewing
+    while the job runs. Only jobs whose lease has expired (owner crashed or was killed) are taken
+    back and re-queued, by resume() at startup and by the maintenance thread while the server runs.
+
+    The same thread deletes finished jobs older than retention_seconds and refreshes the status
+    counts stats() reports, so /health and /metrics never query the database themselves.
+    """
+
+    def __init__(self, db_path: str, max_workers: int, callback_timeout: float = 10.0, callback_retries: int = 3,
+                 callback_allowed_hosts: Iterable[str] = (), lease_seconds: float = 60.0,
+                 retention_seconds: float = 7 * 24 * 3600, stats_interval: float = 5.0):
+        self.db_path = db_path
+        self.pool = InstrumentedPool("jobs", "thread", max_workers)
+        self.callback_timeout = callback_timeout
+        self.callback_retries = callback_retries
+        self.callback_allowed_hosts = list(callback_allowed_hosts)
+        self.lease_seconds = max(1.0, lease_seconds)
+        self.retention_seconds = retention_seconds
+        # Renew leases at least three times per lease; refresh counts every stats_interval
+        self.tick_seconds = max(0.1, min(self.lease_seconds / 3, stats_interval))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.pruned = 0
+        self._counts: Dict[str, int] = {}
+        self._pruned_at = 0.0
+        self._handlers: Dict[str, JobHandler] = {}
+        self._conn = None
+        self._lock = threading.Lock()
+        self._maintenance_thread = None
+        self._stopping = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+                "progress REAL NOT NULL DEFAULT 0, message TEXT, params TEXT NOT NULL, "
+                "result TEXT, error TEXT, callback_url TEXT, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+                "owner TEXT, lease_until REAL)"
+            )
+            # Databases created before leases existed
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at)")
+            self._conn.commit()
+        return self._conn
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, params: Dict[str, Any], callback_url: Optional[str] = None) -> str:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, params, callback_url, created_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(params), callback_url, time.time())
+            )
+            conn.commit()
+
+        self.pool.submit(self._run, job_id)
+        return job_id
+
+    def resume(self) -> int:
+        """
+        Re-queue jobs left running by a process that is gone (expired lease), queue every
+        waiting job on this process's pool, and start renewing leases. Jobs another live
+        process is running keep their lease and are left alone.
+        """
+        recovered = self._recover_expired()
+        queued = self._queue_waiting()
+        self._refresh_counts()
+        self._start_maintenance_thread()
+        if recovered:
+            print(f"⚙️ Took back {recovered} jobs whose owner stopped renewing its lease")
+        return queued
+
+    def _recover_expired(self) -> int:
+        """Return running jobs with an expired (or pre-lease, NULL) lease to the queue"""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', progress = 0, message = 'Re-queued after its worker stopped', "
+                "owner = NULL, lease_until = NULL "
+                "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+                (time.time(),)
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    def _claim(self, job_id: str) -> bool:
+        """Atomically move a queued job to running under this process's lease"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, lease_until = ?, started_at = ?, message = 'Started' "
+                "WHERE id = ? AND status = 'queued'",
+                (self.owner, now + self.lease_seconds, now, job_id)
+            )
+            conn.commit()
+        return cursor.rowcount == 1
+
+    def _renew_leases(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = 'running'",
+                (time.time() + self.lease_seconds, self.owner)
+            )
+            conn.commit()
+
+    def _prune(self) -> int:
+        """Delete finished jobs older than retention_seconds; 0 or less keeps them forever"""
+        if self.retention_seconds <= 0:
+            return 0
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE finished_at < ? AND status IN ('completed', 'failed')",
+                (time.time() - self.retention_seconds,)
+            )
+            conn.commit()
+        self.pruned += cursor.rowcount
+        return cursor.rowcount
+
+    def _refresh_counts(self):
+        with self._lock:
+            counts = dict(self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        self._counts = counts
+
+    def _maintenance_loop(self):
+        while not self._stopping.wait(self.tick_seconds):
+            try:
+                self._renew_leases()
+                if self._recover_expired():
+                    self._queue_waiting()
+                if time.monotonic() - self._pruned_at >= 60:
+                    self._pruned_at = time.monotonic()
+                    self._prune()
+                self._refresh_counts()
+            except sqlite3.Error as e:
+                print(f"⚠️ Job queue maintenance failed: {str(e)}")
+
+    def _queue_waiting(self) -> int:
+        """Put every queued job on this process's pool; other processes may too, the claim settles it"""
+        with self._lock:
+            job_ids = [row[0] for row in self._connect().execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at"
+            )]
+        for job_id in job_ids:
+            self.pool.submit(self._run, job_id)
+        return len(job_ids)
+
+    def _start_maintenance_thread(self):
+        with self._lock:
+            if self._maintenance_thread is None:
+                self._maintenance_thread = threading.Thread(
+                    target=self._maintenance_loop, name="job-maintenance", daemon=True
+                )
+                self._maintenance_thread.start()
+
+    def _update(self, job_id: str, **fields) -> bool:
+        """Update a job this process owns; False once the lease was lost to another process"""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND owner = ?", (*fields.values(), job_id, self.owner)
+            )
+            conn.commit()
+        return cursor.rowcount == 1
+
+    def _run(self, job_id: str):
+        if not self._claim(job_id):
+            return  # already taken, by this process or another
+        self._start_maintenance_thread()
+        job = self.get(job_id)
+
+        def progress(fraction: float, message: Optional[str] = None):
+            self._update(job_id, progress=round(min(max(fraction, 0.0), 1.0), 3), message=message)
+
+        print(f"⚙️ Job {job_id} ({job['kind']}) started")
+
+        try:
+            result = self._handlers[job["kind"]](job["params"], progress)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {str(e)}")
+            finished = self._update(
+                job_id, status="failed", error=str(e), finished_at=time.time(), message="Failed", lease_until=None
+            )
+        else:
+            print(f"✅ Job {job_id} completed")
+            finished = self._update(
+                job_id, status="completed", progress=1.0, result=json.dumps(result),
+                finished_at=time.time(), message="Completed", lease_until=None
+            )
+
+        if not finished:
+            print(f"⚠️ Job {job_id} lost its lease while running; another process took it back")
+            return
+        if job["callback_url"]:
+            self._send_callback(self.get(job_id))
+
+    def check_callback_url(self, url: Optional[str]):
+        """Validate a client-supplied callback URL at submit time (see check_callback_url)"""
+        if url is not None:
+            check_callback_url(url, self.callback_allowed_hosts)
+
+    def _send_callback(self, job: Dict[str, Any]):
+        import requests  # only needed when a callback is configured
+        for attempt in range(self.callback_retries):
+            try:
+                # Checked again per attempt: the host may resolve elsewhere than at submit time
+                self.check_callback_url(job["callback_url"])
+            except ValueError as e:
+                print(f"⚠️ Job {job['id']} callback refused: {str(e)}")
+                return
+            try:
+                # No redirects: a public URL could otherwise bounce the record to an internal one
+                response = requests.post(
+                    job["callback_url"], json=job, timeout=self.callback_timeout, allow_redirects=False
+                )
+                if response.status_code < 500:
+                    return
+            except requests.RequestException as e:
+                print(f"⚠️ Job {job['id']} callback error: {str(e)}")
+            if attempt < self.callback_retries - 1:
+                time.sleep(2 ** attempt)
+        print(f"⚠️ Job {job['id']} callback gave up after {self.callback_retries} attempts")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT id, kind, status, progress, message, params, result, error, callback_url, "
+                "created_at, started_at, finished_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        (job_id, kind, status, progress, message, params, result, error,
+         callback_url, created_at, started_at, finished_at) = row
+        return {
+            "id": job_id,
+            "kind": kind,
+            "status": status,
+            "progress": progress,
+            "message": message,
+            "params": json.loads(params),
+            "result": json.loads(result) if result is not None else None,
+            "error": error,
+            "callback_url": callback_url,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool figures and job counts by status as of the last maintenance tick (no database access)"""
+        return {"pool": self.pool.stats(), "jobs": dict(self._counts), "pruned": self.pruned}
+
+    def shutdown(self):
+        self._stopping.set()
+        self.pool.shutdown()
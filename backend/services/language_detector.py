@@ -0,0 +1,137 @@
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+from config import settings
+from services.cache import MISSING, LRUCache
+
+
+class LanguageDetector:
+    """
+    langdetect wrapper for long texts and repeat requests:
+
+    - only a bounded sample is analysed: evenly spaced windows across the text, so a long
+      document costs the same as a paragraph and a foreign-language preface doesn't decide it;
+    - the profile factory is seeded, so the same text always gets the same answer;
+    - results are memoized by a hash of the sample (the only input detection depends on).
+    """
+
+    def __init__(self, sample_chars: int = 2000, windows: int = 4, memory_size: int = 4096,
+                 seed: int = 0, default: str = "en"):
+        self.sample_chars = max(1, sample_chars)
+        self.windows = max(1, windows)
+        self.seed = seed
+        self.default = default
+        self.hits = 0
+        self.misses = 0
+        self._memo = LRUCache(memory_size)
+        self._factory = None
+        self._lock = threading.Lock()
+
+    def _get_factory(self):
+        # Loading the ~55 language profiles takes a while; do it once, on first use
+        if self._factory is None:
+            with self._lock:
+                if self._factory is None:
+                    from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+                    factory = DetectorFactory()
+                    factory.load_profile(PROFILES_DIRECTORY)
+                    factory.seed = self.seed
+                    self._factory = factory
+        return self._factory
+
+    def sample(self, text: str) -> str:
+        """
+        At most sample_chars of text: the whole text if it fits, otherwise `windows` evenly
+        spaced windows (first and last included) trimmed to whole words and joined by newlines
+        """
+        text = text.strip()
+        if len(text) <= self.sample_chars:
+            return text
+
+        window = max(1, (self.sample_chars - (self.windows - 1)) // self.windows)
+        if self.windows == 1:
+            starts = [0]
+        else:
+            span = len(text) - window
+            starts = [span * i // (self.windows - 1) for i in range(self.windows)]
+
+        pieces = []
+        for start in starts:
+            piece = text[start:start + window]
+            # Drop the partial words at either edge, unless the window is a single word
+            if start > 0 and not text[start - 1].isspace():
+                head, _, rest = piece.partition(" ")
+                piece = rest or head
+            if start + window < len(text) and not text[start + window].isspace():
+                rest, _, tail = piece.rpartition(" ")
+                piece = rest or tail
+            pieces.append(piece.strip())
+        return "\n".join(piece for piece in pieces if piece)
+
+    @staticmethod
+    def key(sample: str) -> str:
+        return hashlib.blake2b(sample.encode("utf-8"), digest_size=16).hexdigest()
+
+    def cached(self, sample: str) -> Any:
+        """Memoized language for a sample, or MISSING"""
+        language = self._memo.get(self.key(sample))
+        with self._lock:
+            if language is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return language
+
+    def remember(self, sample: str, language: str):
+        self._memo.set(self.key(sample), language)
+
+    def _detect_sample(self, sample: str) -> str:
+        from langdetect.lang_detect_exception import LangDetectException
+        detector = self._get_factory().create()
+        detector.append(sample)
+        try:
+            return detector.detect()
+        except LangDetectException:
+            return self.default  # no letters to go on (digits, symbols, empty text)
+
+    def detect(self, text: str) -> str:
+        """Language code of text; the default when there is nothing to detect"""
+        sample = self.sample(text)
+        language = self.cached(sample)
+        if language is MISSING:
+            language = self._detect_sample(sample)
+            self.remember(sample, language)
+        return language
+
+    def detect_batch(self, texts: List[str]) -> List[str]:
+        """detect for several texts at once; duplicates and memoized samples are analysed only once"""
+        samples = [self.sample(text) for text in texts]
+        languages: Dict[str, str] = {}
+        for sample in samples:
+            if sample in languages:
+                continue
+            language = self.cached(sample)
+            if language is MISSING:
+                language = self._detect_sample(sample)
+                self.remember(sample, language)
+            languages[sample] = language
+        return [languages[sample] for sample in samples]
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "memory_entries": len(self._memo),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+language_detector = LanguageDetector(
+    settings.LANGDETECT_MAX_CHARS,
+    settings.LANGDETECT_WINDOWS,
+    settings.LANGDETECT_CACHE_SIZE,
+    settings.LANGDETECT_SEED
+)
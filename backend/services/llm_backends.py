@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import random
+import re
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Optional
+
+from config import settings
+from services.chunker import estimate_tokens
+from services.http_session import http_clients
+
+
+class LLMBackend:
+    """
+    Chat-completion backend behind the LLM gateway. Methods are called on the gateway's
+    event loop only, so implementations may hold loop-bound clients. Responses and stream
+    chunks have the OpenAI/Groq shape (choices[0].message.content, choices[0].delta.content,
+    usage / x_groq.usage).
+    """
+
+    name = "base"
+
+    async def complete(self, **kwargs) -> Any:
+        raise NotImplementedError
+
+    def stream(self, **kwargs) -> AsyncIterator[Any]:
+        """Async iterator of completion chunks; closing it early must cancel the request"""
+        raise NotImplementedError
+
+    def retry_reason(self, error: Exception) -> Optional[str]:
+        """Why error is worth retrying ("rate_limited", "server_error", "connection"), or None"""
+        return None
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """Seconds the upstream asked us to wait, if it said"""
+        return None
+
+    async def close(self):
+        pass
+
+
+class GroqBackend(LLMBackend):
+    """Groq's API through AsyncGroq, on the shared keep-alive connection pool"""
+
+    name = "groq"
+
+    def __init__(self, api_key: Optional[str]):
+        from groq import AsyncGroq
+        # The gateway owns retries, so the SDK's are off
+        self._client = AsyncGroq(api_key=api_key, max_retries=0, http_client=http_clients.build_groq_async_http_client())
+
+    async def complete(self, **kwargs) -> Any:
+        return await self._client.chat.completions.create(**kwargs)
+
+    async def stream(self, **kwargs) -> AsyncIterator[Any]:
+        stream = await self._client.chat.completions.create(**kwargs, stream=True)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.close()
+
+    def retry_reason(self, error: Exception) -> Optional[str]:
+        from groq import APIConnectionError, APIStatusError, RateLimitError
+        if isinstance(error, RateLimitError):
+            return "rate_limited"
+        if isinstance(error, APIStatusError) and error.status_code >= 500:
+            return "server_error"
+        if isinstance(error, APIConnectionError):
+            return "connection"  # includes timeouts
+        return None
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        try:
+            return float(error.response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    async def close(self):
+        await self._client.close()
+
+
+class LocalBackendError(Exception):
+    """Failure injected by the local backend, standing in for an upstream HTTP error"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Injected upstream failure (HTTP {status_code})")
+        self.status_code = status_code
+
+
+class LocalBackend(LLMBackend):
+    """
+    Offline stand-in for load tests and benchmarks; no network, no quota.
+
+    Output is deterministic for a given prompt and seed: script prompts get about the number
+    of words they ask for (capped at max_words) drawn from a fixed science text, translation
+    prompts get their text back prefixed with "[translated]". Timing follows latency seconds
+    to the first token, then tokens_per_second (0 = instant). failure_rate of calls raise
+    LocalBackendError(failure_status) before any output, drawn from a seeded sequence.
+    """
+
+    name = "local"
+
+    TEXT = (
+        "Photosynthesis is the process plants use to turn light into chemical energy. "
+        "Inside the chloroplasts, chlorophyll absorbs sunlight and drives the splitting of water. "
+        "The oxygen we breathe is released as a by-product, while carbon dioxide is fixed into sugars. "
+        "These sugars fuel growth and, through food chains, almost every living thing on Earth."
+    ).split()
+
+    def __init__(self, latency: float = 0.5, tokens_per_second: float = 200.0, failure_rate: float = 0.0,
+                 failure_status: int = 503, max_words: int = 2000, seed: int = 0):
+        self.latency = max(0.0, latency)
+        self.tokens_per_second = max(0.0, tokens_per_second)
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.max_words = max_words
+        self.seed = seed
+        self._failures = random.Random(seed)
+
+    def _completion_text(self, kwargs) -> str:
+        messages = kwargs.get("messages") or [{}]
+        prompt = str(messages[-1].get("content") or "")
+        if "Text to translate:" in prompt:
+            return "[translated] " + prompt.split("Text to translate:", 1)[1].strip()
+
+        words = re.search(r"approximately (\d+) words", prompt)
+        count = min(int(words.group(1)) if words else 120, self.max_words)
+        digest = hashlib.blake2b(f"{self.seed}:{prompt}".encode("utf-8"), digest_size=8).digest()
+        start = int.from_bytes(digest, "big") % len(self.TEXT)
+        return " ".join(self.TEXT[(start + i) % len(self.TEXT)] for i in range(count))
+
+    def _usage(self, kwargs, text: str) -> SimpleNamespace:
+        prompt_tokens = sum(estimate_tokens(str(message.get("content") or "")) for message in kwargs.get("messages", []))
+        completion_tokens = estimate_tokens(text)
+        return SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+
+    async def _start(self):
+        await asyncio.sleep(self.latency)
+        if self.failure_rate and self._failures.random() < self.failure_rate:
+            raise LocalBackendError(self.failure_status)
+
+    def _generation_seconds(self, tokens: int) -> float:
+        return tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    async def complete(self, **kwargs) -> Any:
+        await self._start()
+        text = self._completion_text(kwargs)
+        usage = self._usage(kwargs, text)
+        await asyncio.sleep(self._generation_seconds(usage.completion_tokens))
+        return SimpleNamespace(
+            id=f"local-{uuid.uuid4().hex}",
+            object="chat.completion",
+            created=int(time.time()),
+            model=kwargs.get("model", ""),
+            choices=[SimpleNamespace(
+                index=0,
+                message=SimpleNamespace(role="assistant", content=text),
+                finish_reason="stop"
+            )],
+            usage=usage
+        )
+
+    async def stream(self, **kwargs) -> AsyncIterator[Any]:
+        await self._start()
+        text = self._completion_text(kwargs)
+        usage = self._usage(kwargs, text)
+        words = text.split(" ")
+        # Spread the generation time over the words, each word's share by its token estimate
+        for i, word in enumerate(words):
+            piece = word if i == len(words) - 1 else word + " "
+            await asyncio.sleep(self._generation_seconds(estimate_tokens(piece)))
+            yield _chunk(piece)
+        final = _chunk(None, finish_reason="stop")
+        final.x_groq = SimpleNamespace(usage=usage)
+        yield final
+
+    def retry_reason(self, error: Exception) -> Optional[str]:
+        if isinstance(error, LocalBackendError):
+            if error.status_code == 429:
+                return "rate_limited"
+            if error.status_code >= 500:
+                return "server_error"
+        return None
+
+
+def _chunk(content: Optional[str], finish_reason: Optional[str] = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        object="chat.completion.chunk",
+        choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=content), finish_reason=finish_reason)],
+        x_groq=None
+    )
+
+
+BACKENDS = ("groq", "local")
+
+
+def create_backend(name: str, api_key: Optional[str] = None) -> LLMBackend:
+    """Build the backend selected by LLM_BACKEND; the local backend takes its settings from LOCAL_LLM_*"""
+    if name == "groq":
+        return GroqBackend(api_key)
+    if name == "local":
+        return LocalBackend(
+            latency=settings.LOCAL_LLM_LATENCY,
+            tokens_per_second=settings.LOCAL_LLM_TOKENS_PER_SECOND,
+            failure_rate=settings.LOCAL_LLM_FAILURE_RATE,
+            failure_status=settings.LOCAL_LLM_FAILURE_STATUS,
+            seed=settings.LOCAL_LLM_SEED
+        )
+    raise ValueError(f"Unknown LLM backend: {name} (expected one of: {', '.join(BACKENDS)})")
@@ -0,0 +1,316 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from services.chunker import estimate_tokens
+from services.llm_backends import LLMBackend
+from services.metrics import registry, track_stage
+
+llm_call_duration = registry.histogram(
+    "eduai_llm_call_duration_seconds",
+    "Upstream LLM call latency per attempt (streams: until the last chunk)",
+    ("operation", "model", "outcome")
+)
+llm_queue_wait = registry.histogram(
+    "eduai_llm_queue_wait_seconds",
+    "Time a call waited for rate-limit budget and a concurrency slot",
+    ("operation",)
+)
+llm_tokens_total = registry.counter(
+    "eduai_llm_tokens_total", "Tokens billed by the upstream, from its usage reports", ("model", "kind")
+)
+llm_retries_total = registry.counter(
+    "eduai_llm_retries_total", "LLM call attempts that were retried", ("reason",)
+)
+
+_STREAM_END = object()
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at per_minute; holds at most one minute's worth.
+    Belongs to one event loop. Waiters are served in arrival order, and the balance may go
+    negative when a call turns out to cost more than reserved, delaying the calls after it.
+    per_minute <= 0 disables the limit.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float):
+        if not self.enabled:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        amount = min(amount, self.capacity)  # a call bigger than the bucket waits for a full one
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        """Return unused reservation (positive) or charge an overrun (negative)"""
+        if self.enabled:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LLMGateway:
+    """
+    The one upstream pipe for chat completions.
+
+    Every call, from any worker thread or event loop, runs on the gateway's own event loop
+    with a single backend (see services/llm_backends.py), so all requests share one
+    keep-alive connection pool, one concurrency limit and one pair of RPM/TPM token buckets.
+    Errors the backend marks as retryable (429s, 5xx responses, connection errors) are retried
+    with jittered exponential backoff; Retry-After wins when the upstream sends it.
+
+    Blocking callers use complete() and stream(); coroutines on another loop await acomplete().
+    """
+
+    def __init__(self, backend_factory: Callable[[], LLMBackend], max_concurrency: int = 16, requests_per_minute: int = 0,
+                 tokens_per_minute: int = 0, completion_tokens_estimate: int = 1024, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0):
+        self.backend_factory = backend_factory
+        self.max_concurrency = max(1, max_concurrency)
+        self.completion_tokens_estimate = completion_tokens_estimate
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self._loop = None
+        self._thread = None
+        self._backend = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    # Event loop -------------------------------------------------------------
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the gateway loop (idempotent); the backend itself is built on the first call"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def _submit(self, coroutine):
+        """Schedule a coroutine on the gateway loop; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.start())
+
+    def _get_backend(self) -> LLMBackend:
+        # Only touched from the gateway loop, so no lock; backends may hold loop-bound clients
+        if self._backend is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._backend = self.backend_factory()
+        return self._backend
+
+    # Public API -------------------------------------------------------------
+
+    def complete(self, operation: str = "completion", **kwargs) -> Any:
+        """Blocking chat completion; kwargs are passed to chat.completions.create"""
+        return self._submit(self._complete(operation, kwargs)).result()
+
+    async def acomplete(self, operation: str = "completion", **kwargs) -> Any:
+        """Chat completion awaited from another event loop (e.g. the app's)"""
+        return await asyncio.wrap_future(self._submit(self._complete(operation, kwargs)))
+
+    def stream(self, operation: str = "stream", **kwargs) -> Iterator[Any]:
+        """
+        Blocking iterator over streamed completion chunks. Closing it early (client went away)
+        cancels the upstream request and frees its concurrency slot.
+        """
+        chunks = queue.Queue()
+        future = self._submit(self._stream(operation, kwargs, chunks.put))
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is _STREAM_END:
+                    break
+                yield chunk
+            future.result()  # re-raise an upstream failure
+        finally:
+            future.cancel()
+
+    # Internals --------------------------------------------------------------
+
+    def _reserve_tokens(self, kwargs: Dict[str, Any]) -> int:
+        prompt = sum(estimate_tokens(str(message.get("content") or "")) for message in kwargs.get("messages", []))
+        return prompt + (kwargs.get("max_tokens") or self.completion_tokens_estimate)
+
+    async def _admit(self, operation: str, reserved: int):
+        """Wait for rate-limit budget, then a concurrency slot"""
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(reserved)
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+            llm_queue_wait.observe(time.perf_counter() - started, operation=operation)
+        self.in_flight += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def _record_usage(self, model: str, usage: Any, reserved: int):
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        llm_tokens_total.inc(prompt_tokens, model=model, kind="prompt")
+        llm_tokens_total.inc(completion_tokens, model=model, kind="completion")
+        self.token_bucket.adjust(reserved - prompt_tokens - completion_tokens)
+
+    def _retry_delay(self, backend: LLMBackend, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None when the error isn't worth retrying"""
+        reason = backend.retry_reason(error)
+        if reason is None or attempt >= self.max_retries:
+            return None
+
+        delay = backend.retry_after(error)
+        if delay is None:
+            delay = self.backoff_base * (2 ** attempt)
+            delay = random.uniform(delay / 2, delay)
+        delay = min(delay, self.backoff_max)
+        llm_retries_total.inc(reason=reason)
+        self.retries += 1
+        print(f"⏳ LLM call failed ({reason}), retrying in {delay:.1f}s (attempt {attempt + 1})")
+        return delay
+
+    async def _complete(self, operation: str, kwargs: Dict[str, Any]) -> Any:
+        backend = self._get_backend()
+        model = kwargs.get("model", "")
+        reserved = self._reserve_tokens(kwargs)
+        self.calls += 1
+
+        for attempt in range(self.max_retries + 1):
+            await self._admit(operation, reserved)
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                with track_stage("groq_completion"):
+                    response = await backend.complete(**kwargs)
+                outcome = "ok"
+            except Exception as e:
+                delay = self._retry_delay(backend, e, attempt)
+                if delay is None:
+                    self.failures += 1
+                    raise
+                outcome = "retried"
+            finally:
+                self._release()
+                llm_call_duration.observe(time.perf_counter() - started, operation=operation, model=model, outcome=outcome)
+
+            if outcome == "ok":
+                self._record_usage(model, getattr(response, "usage", None), reserved)
+                return response
+            await asyncio.sleep(delay)
+
+    async def _stream(self, operation: str, kwargs: Dict[str, Any], emit):
+        """
+        Stream chunks into emit. Only opening the stream is retried: once chunks have been
+        handed out a retry would duplicate them.
+        """
+        backend = self._get_backend()
+        model = kwargs.get("model", "")
+        reserved = self._reserve_tokens(kwargs)
+        self.calls += 1
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self._admit(operation, reserved)
+                started = time.perf_counter()
+                outcome = "error"
+                usage = None
+                emitted = False
+                try:
+                    stream = backend.stream(**kwargs)
+                    try:
+                        async for chunk in stream:
+                            # Usage comes on the final chunk (Groq's x_groq extension)
+                            x_groq = getattr(chunk, "x_groq", None)
+                            usage = getattr(x_groq, "usage", None) or usage
+                            emit(chunk)
+                            emitted = True
+                    finally:
+                        await stream.aclose()
+                    outcome = "ok"
+                except asyncio.CancelledError:
+                    outcome = "cancelled"
+                    raise
+                except Exception as e:
+                    delay = None if emitted else self._retry_delay(backend, e, attempt)
+                    if delay is None:
+                        self.failures += 1
+                        raise
+                    outcome = "retried"
+                finally:
+                    self._release()
+                    llm_call_duration.observe(time.perf_counter() - started, operation=operation, model=model, outcome=outcome)
+
+                if outcome == "ok":
+                    self._record_usage(model, usage, reserved)
+                    return
+                await asyncio.sleep(delay)
+        finally:
+            emit(_STREAM_END)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self._backend.name if self._backend is not None else None,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "requests_per_minute": self.request_bucket.capacity or None,
+            "tokens_per_minute": self.token_bucket.capacity or None
+        }
+
+    def close(self):
+        loop = self._loop
+        if loop is None:
+            return
+        if self._backend is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._backend.close(), loop).result(timeout=5)
+            except Exception:
+                pass
+            self._backend = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List
+
+from services.executor import InstrumentedPool, io_pool
+from services.metrics import registry
+
+coalesced_requests_total = registry.counter(
+    "eduai_coalesced_requests_total",
+    "Calls that joined an identical call already in flight instead of making their own",
+    ("function",)
+)
+
+_flights: List["SingleFlight"] = []
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls of a blocking function into one. The first caller for a
+    set of arguments runs it; callers arriving with the same arguments while it is in flight wait
+    for that run and get its result (or its exception). Nothing is kept once the call completes,
+    so this deduplicates load spikes without caching.
+
+    Positional arguments are the key, so they must be hashable. Keyword arguments (a progress
+    callback, say) are not part of the key and only reach the leading call. Results are shared,
+    not copied.
+    """
+
+    def __init__(self, function: Callable, name: str = None):
+        self.function = function
+        self.name = name or function.__name__
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        _flights.append(self)
+
+    def _join(self, key: Hashable, start: Callable[[], Future]) -> Future:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                coalesced_requests_total.inc(function=self.name)
+                return future
+            self.calls += 1
+            future = self._in_flight[key] = start()
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def __call__(self, *args, **kwargs) -> Any:
+        """Blocking call from a worker thread (background jobs)"""
+        owner = Future()
+        future = self._join(args, lambda: owner)
+        if future is owner:
+            owner.set_running_or_notify_cancel()
+            try:
+                owner.set_result(self.function(*args, **kwargs))
+            except BaseException as e:
+                owner.set_exception(e)
+        return future.result()
+
+    async def run(self, *args, pool: InstrumentedPool = io_pool, **kwargs) -> Any:
+        """
+        Await the call from the event loop; the leader's call runs in pool. Waiters are shielded,
+        so a client that disconnects doesn't cancel the run the others are waiting on.
+        """
+        future = self._join(args, lambda: pool.submit(self.function, *args, **kwargs))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.calls + self.coalesced
+            return {
+                "in_flight": len(self._in_flight),
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / requests, 3) if requests else 0.0
+            }
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    return {flight.name: flight.stats() for flight in _flights}
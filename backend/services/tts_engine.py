@@ -0,0 +1,80 @@
+import io
+import re
+from collections import deque
+from typing import Iterator, List
+
+from config import settings
+from services.executor import InstrumentedPool
+from services.metrics import track_stage
+
+# Sentence ends: ., !, ? (plus CJK/Urdu/Hindi equivalents) followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？۔।])\s+")
+
+# Shared by every synthesis request so total gTTS concurrency stays bounded
+tts_pool = InstrumentedPool("tts", "thread", settings.TTS_WORKERS)
+
+
+def split_sentences(text: str, max_chars: int = None) -> List[str]:
+    """Split text on sentence boundaries and pack sentences into segments of up to max_chars"""
+    max_chars = max_chars or settings.TTS_SEGMENT_MAX_CHARS
+    segments = []
+    current = []
+    current_length = 0
+
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if not sentence:
+            continue
+        # A sentence longer than max_chars becomes its own segment; gTTS splits it further
+        if current and current_length + 1 + len(sentence) > max_chars:
+            segments.append(" ".join(current))
+            current = []
+            current_length = 0
+        current.append(sentence)
+        current_length += len(sentence) + (1 if current_length else 0)
+
+    if current:
+        segments.append(" ".join(current))
+    return segments
+
+
+def synthesize_segment(text: str, language: str) -> bytes:
+    """Synthesize one segment to MP3 bytes"""
+    from gtts import gTTS  # imported on first use to keep startup fast
+    tts = gTTS(text=text, lang=language, slow=False)
+    audio_buffer = io.BytesIO()
+    with track_stage("gtts_synthesis"):
+        tts.write_to_fp(audio_buffer)
+    return audio_buffer.getvalue()
+
+
+def synthesize_stream(text: str, language: str, window: int = None) -> Iterator[bytes]:
+    """
+    Yield MP3 data segment by segment, in order.
+    Up to `window` segments are synthesized ahead on the shared TTS pool; MP3 frames
+    concatenate cleanly, so the yielded chunks form one playable file.
+    """
+    window = max(1, window or settings.TTS_STREAM_WINDOW)
+    segments = iter(split_sentences(text))
+    pending = deque()
+
+    try:
+        for segment in segments:
+            pending.append(tts_pool.submit(synthesize_segment, segment, language))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            audio_data = pending.popleft().result()
+            next_segment = next(segments, None)
+            if next_segment is not None:
+                pending.append(tts_pool.submit(synthesize_segment, next_segment, language))
+            yield audio_data
+    finally:
+        # Client went away or a segment failed: don't keep synthesizing audio nobody will hear
+        for future in pending:
+            future.cancel()
+
+
+def synthesize(text: str, language: str) -> bytes:
+    """Synthesize the full text, segments in parallel, into a single MP3"""
+    return b"".join(synthesize_stream(text, language))
@@ -0,0 +1,52 @@
+from typing import Iterable
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware capping request bodies on upload routes before anything parses them.
+
+    FastAPI reads a multipart form in full (into Starlette's own spool) before the endpoint
+    runs, so a size check in the handler only fires after the whole body has arrived. Here a
+    declared Content-Length over max_bytes is answered with 413 without reading the body, and
+    bodies without one (chunked) are counted as they stream in and cut off at the limit.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_bytes: int, detail: str = "Request body too large"):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_bytes = max_bytes
+        self.detail = detail
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = None
+                if declared is not None and declared > self.max_bytes:
+                    response = JSONResponse({"detail": self.detail}, status_code=413, headers={"Connection": "close"})
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside the form parser; FastAPI passes HTTPExceptions through as responses
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
+
+        await self.app(scope, counting_receive, send)
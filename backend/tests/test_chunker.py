@@ -0,0 +1,90 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_logic import assemble_translation  # noqa: E402
+from services.chunker import estimate_tokens, split_by_tokens, split_outer_whitespace  # noqa: E402
+
+SENTENCE = "Chlorophyll absorbs red and blue light, reflecting green; this is why leaves look green to us. "
+URDU_SENTENCE = "پودے سورج کی روشنی سے اپنی خوراک بناتے ہیں، اور آکسیجن خارج کرتے ہیں۔ "
+
+SAMPLES = {
+    "empty": "",
+    "whitespace_only": "  \n\n \t",
+    "paragraphs": "\n\n".join(SENTENCE * n for n in (2, 5, 8, 3)),
+    "one_long_paragraph": SENTENCE * 200,
+    "numbered_lines": "\n".join(f"{i}. {SENTENCE}" for i in range(50)),
+    "urdu": "\n\n".join(URDU_SENTENCE * n for n in (2, 6, 4)),
+    "cjk_without_spaces": "光合作用是植物利用光能的过程。" * 40,
+    "word_without_spaces": "x" * 500,
+    "outer_whitespace": "\n\n  " + SENTENCE * 5 + "\n\n" + SENTENCE * 5 + "  \n",
+}
+
+# The same building blocks the chunking benchmark fuzzes with: every boundary kind and script
+FUZZ_PIECES = [
+    "word ", "Sentence ends. ", "Question? ", "clause, ", "semi; ", "\n", "\n\n", "  \n \n",
+    "۔ ", "。", "中文", "x" * 80, "12345", "\t", "naïve ", "_"
+]
+
+
+def fuzz_cases(rounds=500, seed=1):
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        text = "".join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 300)))
+        yield text, rng.choice([1, 3, 10, 50, 400])
+
+
+@pytest.mark.parametrize("budget", [1, 7, 50, 400, 1500])
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_split_is_lossless_and_within_budget(name, budget):
+    text = SAMPLES[name]
+    chunks = split_by_tokens(text, budget)
+    assert "".join(chunks) == text
+    assert all(estimate_tokens(chunk) <= budget for chunk in chunks)
+
+
+def test_split_fuzz_is_lossless_and_within_budget():
+    for text, budget in fuzz_cases():
+        chunks = split_by_tokens(text, budget)
+        assert "".join(chunks) == text, (text, budget)
+        assert all(estimate_tokens(chunk) <= budget for chunk in chunks), (text, budget)
+
+
+def test_split_prefers_paragraph_boundaries():
+    paragraphs = [SENTENCE * 3] * 4
+    text = "\n\n".join(paragraphs)
+    budget = estimate_tokens(paragraphs[0] + "\n\n")
+    chunks = split_by_tokens(text, budget)
+    assert [chunk.strip() for chunk in chunks] == [paragraph.strip() for paragraph in paragraphs]
+
+
+def test_text_within_budget_is_one_chunk():
+    assert split_by_tokens(SENTENCE, 1000) == [SENTENCE]
+
+
+@pytest.mark.parametrize("chunk", ["  body  ", "\n\nbody\n", "body", "   ", ""])
+def test_split_outer_whitespace_round_trips(chunk):
+    assert "".join(split_outer_whitespace(chunk)) == chunk
+
+
+def test_assemble_translation_restores_whitespace_between_chunks():
+    text = SAMPLES["paragraphs"]
+    chunks = split_by_tokens(text, 30)
+    assert len(chunks) > 1
+    # An identity "translation" of each body must give back the original text
+    bodies = [split_outer_whitespace(chunk)[1] for chunk in chunks]
+    assembled = assemble_translation(chunks, bodies, "Spanish")
+    translation, _, note = assembled.rpartition("\n\n---\n")
+    assert translation == text.strip()
+    assert note == "*Translated to Spanish using AI*"
+
+
+def test_assemble_translation_keeps_paragraph_breaks():
+    chunks = ["First paragraph.\n\n", "Second paragraph.\n\n", "Third."]
+    translated = ["Primer párrafo.", "Segundo párrafo.", "Tercero."]
+    assembled = assemble_translation(chunks, translated, "Spanish")
+    assert assembled.startswith("Primer párrafo.\n\nSegundo párrafo.\n\nTercero.\n\n---\n")